@@ -2,24 +2,31 @@
 from __future__ import annotations
 
 import argparse
-import concurrent.futures
-import hashlib
+import functools
 import importlib.util
+import itertools
 import json
 import os
+import re
 import shutil
-import subprocess
 import sys
 import time
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator, NamedTuple
 
 
+@functools.lru_cache(maxsize=None)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+@functools.lru_cache(maxsize=65536)
+def _resolved(path: str) -> Path:
+    return Path(path).resolve()
+
+
 def _load_module(name: str, path: Path):
     spec = importlib.util.spec_from_file_location(name, path)
     assert spec and spec.loader
@@ -29,10 +36,15 @@ def _load_module(name: str, path: Path):
     return mod
 
 
-def _json_dumps(obj: Any, *, indent: int | None = 2) -> str:
-    if indent is None:
-        return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")) + "\n"
-    return json.dumps(obj, sort_keys=True, ensure_ascii=False, indent=indent) + "\n"
+_RNAVIEW_OUT_CORE: Any = None
+
+
+def _load_rnaview_out_core():
+    # Also the home of the shared JSON helpers (_json_dumps_bytes/_json_loads_bytes).
+    global _RNAVIEW_OUT_CORE
+    if _RNAVIEW_OUT_CORE is None:
+        _RNAVIEW_OUT_CORE = _load_module("rnaview_out_core", _repo_root() / "tools" / "rnaview_out_core.py")
+    return _RNAVIEW_OUT_CORE
 
 
 def _has_glob_chars(text: str) -> bool:
@@ -47,6 +59,23 @@ def _iter_list_file(path: Path) -> Iterable[str]:
         yield s
 
 
+def _iter_tree_files(root: str) -> Iterator[os.DirEntry[str]]:
+    # Like rglob("*") restricted to files: symlinked dirs are not descended into,
+    # and DirEntry's cached d_type avoids a stat() per entry.
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
 def _collect_inputs(items: list[str], list_files: list[str]) -> list[Path]:
     repo = _repo_root()
     out: list[Path] = []
@@ -76,13 +105,15 @@ def _collect_inputs(items: list[str], list_files: list[str]) -> list[Path]:
         if not p.is_absolute():
             p = (repo / p).resolve() if (repo / p).exists() else p.resolve()
         if p.is_dir():
-            for cand in sorted(p.rglob("*")):
-                if cand.is_file():
-                    if cand.suffix.lower() not in allowed_exts:
-                        continue
-                    if cand.name.lower().endswith(excluded_name_suffixes):
-                        continue
-                    out.append(cand)
+            found: list[Path] = []
+            for entry in _iter_tree_files(str(p)):
+                name = entry.name.lower()
+                if os.path.splitext(name)[1] not in allowed_exts:
+                    continue
+                if name.endswith(excluded_name_suffixes):
+                    continue
+                found.append(Path(entry.path))
+            out.extend(sorted(found))
             continue
         if p.is_file():
             if p.suffix.lower() not in allowed_exts:
@@ -95,7 +126,7 @@ def _collect_inputs(items: list[str], list_files: list[str]) -> list[Path]:
     uniq: list[Path] = []
     for p in out:
         try:
-            rp = p.resolve()
+            rp = _resolved(str(p))
         except OSError:
             continue
         if rp in seen:
@@ -105,22 +136,26 @@ def _collect_inputs(items: list[str], list_files: list[str]) -> list[Path]:
     return uniq
 
 
+# \w is str.isalnum() plus "_", so non-ASCII letters keep their job_ids.
+_RE_JOB_ID_UNSAFE = re.compile(r"[^\w.-]")
+
+
 def _sanitize_job_id(text: str) -> str:
-    out_chars: list[str] = []
-    for ch in text:
-        if ch.isalnum() or ch in ("-", "_", "."):
-            out_chars.append(ch)
-        else:
-            out_chars.append("_")
-    out = "".join(out_chars).strip("._")
-    return out or "job"
+    return _RE_JOB_ID_UNSAFE.sub("_", text).strip("._") or "job"
+
 
+def _hash8(text: str, algo: str = "sha1") -> str:
+    import hashlib
 
-def _hash8(text: str) -> str:
-    return hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()[:8]
+    data = text.encode("utf-8", errors="replace")
+    if algo == "sha1":
+        return hashlib.sha1(data).hexdigest()[:8]
+    if algo == "blake2b":
+        return hashlib.blake2b(data, digest_size=4).hexdigest()
+    raise ValueError(f"unknown hash-algo: {algo}")
 
 
-def _job_id_for_input(path: Path, mode: str) -> str:
+def _job_id_for_input(path: Path, mode: str, hash_algo: str = "sha1") -> str:
     if mode == "stem":
         base = path.stem
         return _sanitize_job_id(base)
@@ -128,10 +163,10 @@ def _job_id_for_input(path: Path, mode: str) -> str:
         return _sanitize_job_id(path.name)
     if mode == "stem-hash":
         base = _sanitize_job_id(path.stem)
-        return f"{base}__{_hash8(str(path))}"
+        return f"{base}__{_hash8(str(path), hash_algo)}"
     if mode == "name-hash":
         base = _sanitize_job_id(path.name)
-        return f"{base}__{_hash8(str(path))}"
+        return f"{base}__{_hash8(str(path), hash_algo)}"
     raise ValueError(f"unknown job-id-mode: {mode}")
 
 
@@ -159,8 +194,7 @@ def _legacy_cli_flags(fmt: str | None, ps: bool) -> list[str]:
     return flags
 
 
-@dataclass(frozen=True)
-class JobResult:
+class JobResult(NamedTuple):
     input: str
     job_id: str
     engine: str  # "legacy" | "rust"
@@ -172,10 +206,10 @@ class JobResult:
     regress_ok: bool | None = None
     regress_diffs: list[str] | None = None
     elapsed_ms: int | None = None
+    duplicate_of: str | None = None
 
 
-@dataclass(frozen=True)
-class GoldenEntry:
+class GoldenEntry(NamedTuple):
     out_path: Path
     core_path: Path
 
@@ -187,6 +221,24 @@ class RegressIndex:
     by_dir_single: dict[Path, GoldenEntry]
 
 
+_FICLONE = 0x40049409  # Linux ioctl: share src's extents with dst (btrfs/XFS reflink)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with src.open("rb") as fin, dst.open("wb") as fout:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
 def _maybe_copy(src: Path, dst: Path) -> None:
     dst.parent.mkdir(parents=True, exist_ok=True)
     try:
@@ -196,11 +248,17 @@ def _maybe_copy(src: Path, dst: Path) -> None:
         return
     except OSError:
         pass
+    if _reflink(src, dst):
+        return
+    # copy2 already goes through os.sendfile on Linux.
     shutil.copy2(src, dst)
 
 
+_RE_NON_ALNUM = re.compile(r"[\W_]+")
+
+
 def _canon_stem(text: str) -> str:
-    return "".join(ch.lower() for ch in text if ch.isalnum())
+    return _RE_NON_ALNUM.sub("", text).lower()
 
 
 def _lookup_golden_entry(input_path: Path, idx: RegressIndex) -> GoldenEntry | None:
@@ -208,7 +266,7 @@ def _lookup_golden_entry(input_path: Path, idx: RegressIndex) -> GoldenEntry | N
     if direct is not None:
         return direct
 
-    directory = input_path.parent.resolve()
+    directory = _resolved(str(input_path.parent))
     canon = _canon_stem(input_path.name)
     by_canon = idx.by_dir_canon.get((directory, canon))
     if by_canon is not None:
@@ -217,6 +275,41 @@ def _lookup_golden_entry(input_path: Path, idx: RegressIndex) -> GoldenEntry | N
     return idx.by_dir_single.get(directory)
 
 
+@functools.lru_cache(maxsize=1024)
+def _load_golden_core(path: str, mtime_ns: int) -> Any:
+    return _load_rnaview_out_core()._json_loads_bytes(Path(path).read_bytes())
+
+
+def _golden_core(golden: GoldenEntry) -> Any:
+    # Cached per worker process; mtime_ns in the key picks up re-frozen goldens.
+    # Callers must treat the returned object as read-only. A pre-pickled store
+    # shared by all workers was measured: unpickling is barely faster than orjson
+    # on these cores, and building it adds a serial pass over the whole manifest.
+    return _load_golden_core(str(golden.core_path), golden.core_path.stat().st_mtime_ns)
+
+
+def _file_digest(path: Path) -> bytes:
+    import hashlib
+
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _golden_out_digest(path: str, mtime_ns: int) -> bytes:
+    return _file_digest(Path(path))
+
+
+def _out_matches_golden(golden_out: Path, candidate: Path) -> bool:
+    golden_st = golden_out.stat()
+    if golden_st.st_size != candidate.stat().st_size:
+        return False
+    return _golden_out_digest(str(golden_out), golden_st.st_mtime_ns) == _file_digest(candidate)
+
+
 def _unified_diff(a: str, b: str, *, fromfile: str, tofile: str, max_lines: int) -> list[str]:
     import difflib
 
@@ -254,6 +347,20 @@ def _sysroot_env() -> dict[str, str]:
     return env
 
 
+@functools.lru_cache(maxsize=None)
+def _engine_env(engine: str) -> dict[str, str]:
+    # None of the overrides are job-specific, so each worker builds the child env
+    # once and hands the same (never mutated) dict to every subprocess it starts.
+    repo = _repo_root()
+    env = dict(os.environ)
+    env["RNAVIEW"] = str(repo)
+    if engine == "legacy":
+        env["PATH"] = f"{repo / 'bin'}:{env.get('PATH', '')}"
+    else:
+        env.update(_sysroot_env())
+    return env
+
+
 def _find_rust_hotcore_binary(repo: Path) -> Path | None:
     candidates = [
         repo / "rust" / "target" / "release" / "rnaview-hotcore",
@@ -306,6 +413,8 @@ def _ensure_rust_hotcore_binary(repo: Path) -> Path:
     else:
         cmd = [cargo, "build", "--manifest-path", str(manifest)]
 
+    import subprocess
+
     proc = subprocess.run(cmd, cwd=str(repo), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False)
     if proc.returncode != 0:
         raise RuntimeError(f"failed to build rust engine (code={proc.returncode}):\n{proc.stdout}")
@@ -316,23 +425,87 @@ def _ensure_rust_hotcore_binary(repo: Path) -> Path:
     return found
 
 
+def _split_identical_inputs(inputs: list[Path]) -> tuple[list[Path], dict[Path, Path]]:
+    # Only files whose size collides with another input are hashed.
+    sizes: dict[Path, int] = {}
+    for p in inputs:
+        try:
+            sizes[p] = p.stat().st_size
+        except OSError:
+            continue
+    # Counted per input, not per dict entry, so a path listed twice still
+    # collides with itself.
+    size_counts = Counter([sizes[p] for p in inputs if p in sizes])
+
+    unique: list[Path] = []
+    duplicates: dict[Path, Path] = {}
+    canonical: dict[tuple[int, bytes], Path] = {}
+    for p in inputs:
+        size = sizes.get(p)
+        if size is None or size_counts[size] == 1:
+            unique.append(p)
+            continue
+        key = (size, _file_digest(p))
+        first = canonical.get(key)
+        if first is None:
+            canonical[key] = p
+            unique.append(p)
+        else:
+            duplicates[p] = first
+    return unique, duplicates
+
+
+def _first_out_file(directory: Path, *, skip: str) -> Path | None:
+    best: str | None = None
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name == skip or not name.endswith(".out") or not entry.is_file():
+                continue
+            if best is None or name < best:
+                best = name
+    return directory / best if best is not None else None
+
+
+# The log is handed to the child as a raw fd (no Python file object, no pipe).
+# os.posix_spawn cannot set a cwd and the engines must run inside the job dir, so
+# this stays on subprocess, which already launches via vfork+exec on Linux.
+# close_fds=False skips the per-spawn fd sweep; fds Python opens are
+# non-inheritable by default, so the child still only gets stdio.
+def _run_logged(cmd: list[str], *, cwd: Path, env: dict[str, str], log_path: Path) -> int:
+    import subprocess
+
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o644)
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=str(cwd),
+            env=env,
+            stdout=fd,
+            stderr=subprocess.STDOUT,
+            check=False,
+            close_fds=False,
+        )
+    finally:
+        os.close(fd)
+    return proc.returncode
+
+
 def _run_one_legacy(
     *,
     input_path: Path,
     out_dir: Path,
     job_id_mode: str,
+    hash_algo: str,
     ps: bool,
     overwrite: bool,
     rnaview_bin: Path,
-    out_core_mod: Any,
-    pairs_mod: Any,
-    regress_index: RegressIndex | None,
     regress_mode: str,
     max_diffs: int,
     keep_going: bool,
 ) -> JobResult:
     repo = _repo_root()
-    job_id = _job_id_for_input(input_path, job_id_mode)
+    job_id = _job_id_for_input(input_path, job_id_mode, hash_algo)
     job_dir = (out_dir / job_id).resolve()
     job_dir.mkdir(parents=True, exist_ok=True)
 
@@ -368,7 +541,7 @@ def _run_one_legacy(
     input_arg: str
     local_input: Path
     try:
-        rel = input_path.resolve().relative_to(repo.resolve())
+        rel = _resolved(str(input_path)).relative_to(_resolved(str(repo)))
     except ValueError:
         rel = None
 
@@ -392,37 +565,27 @@ def _run_one_legacy(
         )
 
     log_path = job_dir / "legacy.log"
-    env = dict(os.environ)
-    env["RNAVIEW"] = str(repo)
-    env["PATH"] = f"{repo / 'bin'}:{env.get('PATH', '')}"
+    env = _engine_env("legacy")
 
     cmd = [str(rnaview_bin), *flags, input_arg]
     try:
-        with log_path.open("wb") as log:
-            proc = subprocess.run(
-                cmd,
-                cwd=str(job_dir),
-                env=env,
-                stdout=log,
-                stderr=subprocess.STDOUT,
-                check=False,
-            )
-        if proc.returncode != 0:
+        returncode = _run_logged(cmd, cwd=job_dir, env=env, log_path=log_path)
+        if returncode != 0:
             return JobResult(
                 input=str(input_path),
                 job_id=job_id,
                 engine="legacy",
                 status="failed",
                 job_dir=str(job_dir),
-                error=f"legacy rnaview failed (code={proc.returncode}); see {log_path}",
+                error=f"legacy rnaview failed (code={returncode}); see {log_path}",
                 elapsed_ms=int((time.time() - started) * 1000),
             )
 
-        produced_out = job_dir / Path(f"{input_arg}.out")
+        produced_out = local_input.with_name(local_input.name + ".out")
         if not produced_out.exists():
-            candidates = sorted(job_dir.rglob("*.out"))
-            if candidates:
-                produced_out = candidates[0]
+            found = _first_out_file(local_input.parent, skip=legacy_out_path.name)
+            if found is not None:
+                produced_out = found
             else:
                 return JobResult(
                     input=str(input_path),
@@ -436,29 +599,30 @@ def _run_one_legacy(
 
         shutil.copy2(produced_out, legacy_out_path)
 
-        core = out_core_mod.extract_core(legacy_out_path)
-        pairs = pairs_mod.pairs_json_from_core(
+        core = _WORKER_OUT_CORE_MOD.extract_core(legacy_out_path)
+        pairs = _WORKER_PAIRS_MOD.pairs_json_from_core(
             core,
             source_path=str(input_path),
             source_format=fmt or "unknown",
             options={"engine": "legacy"},
         )
-        pairs_path.write_text(_json_dumps(pairs, indent=None), encoding="utf-8")
+        pairs_path.write_bytes(_WORKER_OUT_CORE_MOD._json_dumps_bytes(pairs))
 
         regress_ok: bool | None = None
         regress_diffs: list[str] | None = None
-        if regress_index is not None:
-            golden = _lookup_golden_entry(input_path, regress_index)
+        if _WORKER_REGRESS_INDEX is not None:
+            golden = _lookup_golden_entry(input_path, _WORKER_REGRESS_INDEX)
             if golden is None:
                 regress_ok = None
             elif regress_mode == "core":
-                golden_core = json.loads(golden.core_path.read_text(encoding="utf-8"))
+                golden_core = _golden_core(golden)
                 if core == golden_core:
                     regress_ok = True
                 else:
-                    diffs = list(out_core_mod._iter_differences(golden_core, core, path=""))
                     regress_ok = False
-                    regress_diffs = diffs[:max_diffs]
+                    regress_diffs = list(
+                        itertools.islice(_WORKER_OUT_CORE_MOD._iter_differences(golden_core, core, path=""), max_diffs)
+                    )
                     if not keep_going:
                         return JobResult(
                             input=str(input_path),
@@ -474,15 +638,13 @@ def _run_one_legacy(
                             elapsed_ms=int((time.time() - started) * 1000),
                         )
             elif regress_mode == "out":
-                golden_text = golden.out_path.read_text(encoding="utf-8", errors="replace")
-                candidate_text = legacy_out_path.read_text(encoding="utf-8", errors="replace")
-                if candidate_text == golden_text:
+                if _out_matches_golden(golden.out_path, legacy_out_path):
                     regress_ok = True
                 else:
                     regress_ok = False
                     regress_diffs = _unified_diff(
-                        golden_text,
-                        candidate_text,
+                        golden.out_path.read_text(encoding="utf-8", errors="replace"),
+                        legacy_out_path.read_text(encoding="utf-8", errors="replace"),
                         fromfile=str(golden.out_path),
                         tofile=str(legacy_out_path),
                         max_lines=max_diffs,
@@ -533,18 +695,17 @@ def _run_one_rust(
     input_path: Path,
     out_dir: Path,
     job_id_mode: str,
+    hash_algo: str,
     overwrite: bool,
     rust_bin: Path,
     legacy_bin: Path,
     mmcif_parser: str,
-    out_core_mod: Any,
-    regress_index: RegressIndex | None,
     regress_mode: str,
     max_diffs: int,
     keep_going: bool,
 ) -> JobResult:
     repo = _repo_root()
-    job_id = _job_id_for_input(input_path, job_id_mode)
+    job_id = _job_id_for_input(input_path, job_id_mode, hash_algo)
     job_dir = (out_dir / job_id).resolve()
     job_dir.mkdir(parents=True, exist_ok=True)
 
@@ -573,9 +734,7 @@ def _run_one_rust(
         )
 
     log_path = job_dir / "rust.log"
-    env = dict(os.environ)
-    env["RNAVIEW"] = str(repo)
-    env.update(_sysroot_env())
+    env = _engine_env("rust")
 
     cmd = [
         str(rust_bin),
@@ -594,23 +753,15 @@ def _run_one_rust(
     ]
 
     try:
-        with log_path.open("wb") as log:
-            proc = subprocess.run(
-                cmd,
-                cwd=str(job_dir),
-                env=env,
-                stdout=log,
-                stderr=subprocess.STDOUT,
-                check=False,
-            )
-        if proc.returncode != 0:
+        returncode = _run_logged(cmd, cwd=job_dir, env=env, log_path=log_path)
+        if returncode != 0:
             return JobResult(
                 input=str(input_path),
                 job_id=job_id,
                 engine="rust",
                 status="failed",
                 job_dir=str(job_dir),
-                error=f"rust engine failed (code={proc.returncode}); see {log_path}",
+                error=f"rust engine failed (code={returncode}); see {log_path}",
                 elapsed_ms=int((time.time() - started) * 1000),
             )
         if not pairs_path.exists():
@@ -624,26 +775,27 @@ def _run_one_rust(
                 elapsed_ms=int((time.time() - started) * 1000),
             )
 
-        pairs = json.loads(pairs_path.read_text(encoding="utf-8"))
+        pairs = _load_rnaview_out_core()._json_loads_bytes(pairs_path.read_bytes())
         core = pairs.get("core", {})
 
         regress_ok: bool | None = None
         regress_diffs: list[str] | None = None
-        if regress_index is not None:
+        if _WORKER_REGRESS_INDEX is not None:
             if regress_mode != "core":
                 raise RuntimeError("--engine rust only supports --regress-mode core (for now)")
 
-            golden = _lookup_golden_entry(input_path, regress_index)
+            golden = _lookup_golden_entry(input_path, _WORKER_REGRESS_INDEX)
             if golden is None:
                 regress_ok = None
             else:
-                golden_core = json.loads(golden.core_path.read_text(encoding="utf-8"))
+                golden_core = _golden_core(golden)
                 if core == golden_core:
                     regress_ok = True
                 else:
-                    diffs = list(out_core_mod._iter_differences(golden_core, core, path=""))
                     regress_ok = False
-                    regress_diffs = diffs[:max_diffs]
+                    regress_diffs = list(
+                        itertools.islice(_WORKER_OUT_CORE_MOD._iter_differences(golden_core, core, path=""), max_diffs)
+                    )
                     if not keep_going:
                         return JobResult(
                             input=str(input_path),
@@ -683,19 +835,19 @@ def _run_one_rust(
 
 def _build_regress_index(manifest_path: Path) -> RegressIndex:
     repo = _repo_root()
-    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest = _load_rnaview_out_core()._json_loads_bytes(manifest_path.read_bytes())
     by_exact_input: dict[Path, GoldenEntry] = {}
     by_dir: dict[Path, list[tuple[str, GoldenEntry]]] = {}
     for entry in manifest.get("entries", []):
         out_rel = Path(entry["out"])
         input_rel = out_rel.with_suffix("")
-        input_path = (repo / input_rel).resolve()
-        out_path = (repo / out_rel).resolve()
-        core_path = (repo / entry["core_json"]).resolve()
+        input_path = _resolved(str(repo / input_rel))
+        out_path = _resolved(str(repo / out_rel))
+        core_path = _resolved(str(repo / entry["core_json"]))
         golden = GoldenEntry(out_path=out_path, core_path=core_path)
         by_exact_input[input_path] = golden
 
-        directory = (repo / out_rel).resolve().parent
+        directory = out_path.parent
         canon = _canon_stem(input_rel.name)
         by_dir.setdefault(directory, []).append((canon, golden))
 
@@ -711,7 +863,94 @@ def _build_regress_index(manifest_path: Path) -> RegressIndex:
     return RegressIndex(by_exact_input=by_exact_input, by_dir_canon=by_dir_canon, by_dir_single=by_dir_single)
 
 
+# Per-process state for batch workers. Module objects are not picklable, so each
+# worker loads the helper modules (and rebuilds the regress index) once in the
+# pool initializer instead of receiving them with every submitted job.
+_WORKER_OUT_CORE_MOD: Any = None
+_WORKER_PAIRS_MOD: Any = None
+_WORKER_REGRESS_INDEX: RegressIndex | None = None
+
+
+def _init_worker(
+    out_core_path: str,
+    pairs_path: str,
+    manifest_path: str | None,
+    cpu_slots: list[int] | None = None,
+    slot_counter: Any = None,
+    nice: int = 0,
+) -> None:
+    global _RNAVIEW_OUT_CORE, _WORKER_OUT_CORE_MOD, _WORKER_PAIRS_MOD, _WORKER_REGRESS_INDEX
+    if cpu_slots:
+        with slot_counter.get_lock():
+            slot = slot_counter.value
+            slot_counter.value += 1
+        # Engine children inherit the mask, so each job stays on its worker's core.
+        os.sched_setaffinity(0, {cpu_slots[slot % len(cpu_slots)]})
+    if nice:
+        os.nice(nice)
+    _RNAVIEW_OUT_CORE = _WORKER_OUT_CORE_MOD = _load_module("rnaview_out_core", Path(out_core_path))
+    _WORKER_PAIRS_MOD = _load_module("rnaview_pairs_json", Path(pairs_path))
+    _WORKER_REGRESS_INDEX = _build_regress_index(Path(manifest_path)) if manifest_path else None
+
+
+def _nice_permitted(increment: int) -> bool:
+    # Raising niceness never needs privileges; lowering it does (CAP_SYS_NICE or
+    # RLIMIT_NICE). Probe on this process, then restore the old value, which is
+    # itself a raise and always allowed.
+    if increment >= 0:
+        return True
+    current = os.getpriority(os.PRIO_PROCESS, 0)
+    try:
+        os.setpriority(os.PRIO_PROCESS, 0, current + increment)
+    except PermissionError:
+        return False
+    os.setpriority(os.PRIO_PROCESS, 0, current)
+    return True
+
+
+def _result_line(r: JobResult) -> bytes:
+    # One results.ndjson line. duplicate_of is only present on --dedupe-identical
+    # duplicates, so regular results keep the schema_version 1 key set.
+    d = r._asdict()
+    if d["duplicate_of"] is None:
+        del d["duplicate_of"]
+    return _load_rnaview_out_core()._json_dumps_bytes(d)
+
+
+def _run_serialized(runner: Any, /, **kwargs: Any) -> tuple[str, str, str, bool | None, bytes]:
+    # Encode the results.ndjson line in the worker; the parent only needs the sort
+    # key and counters, so the full JobResult never crosses the process boundary.
+    r = runner(**kwargs)
+    return r.status, r.job_id, r.input, r.regress_ok, _result_line(r)
+
+
+def _write_summary(
+    path: Path,
+    *,
+    counts: dict[str, int],
+    elapsed_ms: int,
+    results_path: Path,
+    index: list[tuple[str, str, str, int, int]],
+) -> None:
+    # Same keys and values as _json_dumps_bytes(summary, indent=2) from
+    # rnaview_out_core, and the same layout for everything but "results": each
+    # result is copied verbatim from results.ndjson, so it is one compact object
+    # per line instead of indented.
+    counts_text = json.dumps(counts, sort_keys=True, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    with path.open("wb") as fh, results_path.open("rb") as nd:
+        fh.write(b'{\n  "counts": ' + counts_text.encode("utf-8") + b",\n")
+        fh.write(b'  "elapsed_ms": %d,\n' % elapsed_ms)
+        fh.write(b'  "results": [')
+        for n, (_status, _job_id, _input, offset, length) in enumerate(index):
+            nd.seek(offset)
+            fh.write((b",\n    " if n else b"\n    ") + nd.read(length).rstrip(b"\n"))
+        fh.write(b"\n  ],\n" if index else b"],\n")
+        fh.write(b'  "schema_version": 1\n}\n')
+
+
 def _cmd_run(args: argparse.Namespace) -> int:
+    import concurrent.futures
+
     out_dir = Path(args.out_dir).resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -720,6 +959,16 @@ def _cmd_run(args: argparse.Namespace) -> int:
         sys.stderr.write("no inputs\n")
         return 2
 
+    duplicates: dict[Path, Path] = {}
+    if getattr(args, "dedupe_identical", False):
+        # A duplicate is never run, so it would silently miss its own golden
+        # lookup whenever the canonical copy has none (or a different one).
+        if args.regress:
+            sys.stderr.write("--dedupe-identical cannot be combined with --regress\n")
+            return 2
+        inputs, duplicates = _split_identical_inputs(inputs)
+
+    hash_algo = str(getattr(args, "hash_algo", "sha1"))
     engine = str(getattr(args, "engine", "legacy"))
     if engine not in ("legacy", "rust"):
         sys.stderr.write(f"invalid engine: {engine}\n")
@@ -727,6 +976,16 @@ def _cmd_run(args: argparse.Namespace) -> int:
     if getattr(args, "ps", False) and engine != "legacy":
         sys.stderr.write("--ps is only supported with --engine legacy\n")
         return 2
+    nice = int(getattr(args, "nice", 0))
+    if nice:
+        if not hasattr(os, "nice"):
+            sys.stderr.write("--nice is not supported on this platform\n")
+            return 2
+        # Checked here: a PermissionError inside the pool initializer would only
+        # surface as a BrokenProcessPool.
+        if not _nice_permitted(nice):
+            sys.stderr.write(f"--nice {nice} needs privileges this process does not have\n")
+            return 2
 
     repo = _repo_root()
     rnaview_bin = Path(args.rnaview_bin).resolve() if args.rnaview_bin else (repo / "bin" / "rnaview")
@@ -734,20 +993,17 @@ def _cmd_run(args: argparse.Namespace) -> int:
         sys.stderr.write(f"missing rnaview binary: {rnaview_bin} (build via tools/build_legacy_rnaview.sh)\n")
         return 2
 
-    regress_index: RegressIndex | None = None
+    manifest_path: str | None = None
     if args.regress:
         manifest = Path(args.manifest) if args.manifest else _repo_root() / "test" / "golden_core" / "manifest.json"
         if not manifest.exists():
             sys.stderr.write(f"missing manifest: {manifest}\n")
             return 2
-        regress_index = _build_regress_index(manifest)
+        manifest_path = str(manifest.resolve())
         if str(getattr(args, "regress_mode", "core")) != "core" and engine == "rust":
             sys.stderr.write("--engine rust only supports --regress-mode core (for now)\n")
             return 2
 
-    out_core_mod = _load_module("rnaview_out_core", repo / "tools" / "rnaview_out_core.py")
-    pairs_mod = _load_module("rnaview_pairs_json", repo / "tools" / "rnaview_pairs_json.py")
-
     rust_bin: Path | None = None
     if engine == "rust":
         try:
@@ -758,21 +1014,48 @@ def _cmd_run(args: argparse.Namespace) -> int:
 
     started = time.time()
 
-    results: list[JobResult] = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=int(args.workers)) as ex:
+    cpu_slots: list[int] | None = None
+    slot_counter: Any = None
+    if getattr(args, "pin_workers", False):
+        if not hasattr(os, "sched_setaffinity"):
+            sys.stderr.write("--pin-workers is not supported on this platform\n")
+            return 2
+        import multiprocessing
+
+        cpu_slots = sorted(os.sched_getaffinity(0))
+        slot_counter = multiprocessing.Value("i", 0)
+
+    # Results are appended to results.ndjson as they complete; only small sort keys
+    # (plus the line's offset/length) stay in memory until summary.json is assembled.
+    results_path = out_dir / "results.ndjson"
+    index: list[tuple[str, str, str, int, int]] = []
+    counts = {"ok": 0, "skipped": 0, "failed": 0, "regress_failed": 0}
+    # Processes rather than threads: the per-job post-processing (core extraction,
+    # pairs.json rendering, regress diffing) is pure Python and would serialize on the GIL.
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=int(args.workers),
+        initializer=_init_worker,
+        initargs=(
+            str(repo / "tools" / "rnaview_out_core.py"),
+            str(repo / "tools" / "rnaview_pairs_json.py"),
+            manifest_path,
+            cpu_slots,
+            slot_counter,
+            nice,
+        ),
+    ) as ex, results_path.open("wb") as results_file:
         if engine == "legacy":
             futs = [
                 ex.submit(
+                    _run_serialized,
                     _run_one_legacy,
                     input_path=inp,
                     out_dir=out_dir,
                     job_id_mode=args.job_id_mode,
+                    hash_algo=hash_algo,
                     ps=bool(args.ps),
                     overwrite=bool(args.overwrite),
                     rnaview_bin=rnaview_bin,
-                    out_core_mod=out_core_mod,
-                    pairs_mod=pairs_mod,
-                    regress_index=regress_index,
                     regress_mode=str(getattr(args, "regress_mode", "core")),
                     max_diffs=int(args.max_diffs),
                     keep_going=bool(args.keep_going),
@@ -783,56 +1066,66 @@ def _cmd_run(args: argparse.Namespace) -> int:
             assert rust_bin is not None
             futs = [
                 ex.submit(
+                    _run_serialized,
                     _run_one_rust,
                     input_path=inp,
                     out_dir=out_dir,
                     job_id_mode=args.job_id_mode,
+                    hash_algo=hash_algo,
                     overwrite=bool(args.overwrite),
                     rust_bin=rust_bin,
                     legacy_bin=rnaview_bin,
                     mmcif_parser=str(getattr(args, "mmcif_parser", "legacy")),
-                    out_core_mod=out_core_mod,
-                    regress_index=regress_index,
                     regress_mode=str(getattr(args, "regress_mode", "core")),
                     max_diffs=int(args.max_diffs),
                     keep_going=bool(args.keep_going),
                 )
                 for inp in inputs
             ]
+        # Final records of inputs that have duplicates; each duplicate inherits its
+        # canonical job's outcome (a failing input listed N times fails N times).
+        canonical_inputs = {str(first) for first in duplicates.values()}
+        canonical_lines: dict[str, bytes] = {}
         for fut in concurrent.futures.as_completed(futs):
-            results.append(fut.result())
-
-    results.sort(key=lambda r: (r.status, r.job_id, r.input))
-
-    ok = sum(1 for r in results if r.status == "ok")
-    skipped = sum(1 for r in results if r.status == "skipped")
-    failed = sum(1 for r in results if r.status == "failed")
-    regress_failed = sum(1 for r in results if r.regress_ok is False)
-
-    summary = {
-        "schema_version": 1,
-        "counts": {"ok": ok, "skipped": skipped, "failed": failed, "regress_failed": regress_failed},
-        "elapsed_ms": int((time.time() - started) * 1000),
-        "results": [
-            {
-                "input": r.input,
-                "job_id": r.job_id,
-                "engine": r.engine,
-                "status": r.status,
-                "job_dir": r.job_dir,
-                "pairs_json": r.pairs_json,
-                "legacy_out": r.legacy_out,
-                "error": r.error,
-                "regress_ok": r.regress_ok,
-                "regress_diffs": r.regress_diffs,
-                "elapsed_ms": r.elapsed_ms,
-            }
-            for r in results
-        ],
-    }
-    (out_dir / "summary.json").write_text(_json_dumps(summary, indent=2), encoding="utf-8")
-
-    if failed or regress_failed:
+            status, job_id, input_str, regress_ok, line = fut.result()
+            index.append((status, job_id, input_str, results_file.tell(), len(line)))
+            results_file.write(line)
+            counts[status] += 1
+            if regress_ok is False:
+                counts["regress_failed"] += 1
+            if input_str in canonical_inputs:
+                canonical_lines[input_str] = line
+
+        for dup, first in duplicates.items():
+            canon = _load_rnaview_out_core()._json_loads_bytes(canonical_lines[str(first)])
+            # job_dir/pairs_json/legacy_out are the canonical job's: that is where
+            # the outputs for this content were written.
+            r = JobResult(
+                input=str(dup),
+                job_id=_job_id_for_input(dup, args.job_id_mode, hash_algo),
+                engine=engine,
+                status=canon["status"],
+                job_dir=canon["job_dir"],
+                pairs_json=canon.get("pairs_json"),
+                legacy_out=canon.get("legacy_out"),
+                error=canon.get("error"),
+                duplicate_of=str(first),
+            )
+            line = _result_line(r)
+            index.append((r.status, r.job_id, r.input, results_file.tell(), len(line)))
+            results_file.write(line)
+            counts[r.status] += 1
+
+    index.sort()
+    _write_summary(
+        out_dir / "summary.json",
+        counts=counts,
+        elapsed_ms=int((time.time() - started) * 1000),
+        results_path=results_path,
+        index=index,
+    )
+
+    if counts["failed"] or counts["regress_failed"]:
         return 1
     return 0
 
@@ -846,6 +1139,12 @@ def main(argv: list[str] | None = None) -> int:
     run.add_argument("--list", action="append", default=[], help="A file with one input path per line (repeatable)")
     run.add_argument("--out-dir", required=True, help="Output directory")
     run.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Parallel workers")
+    run.add_argument(
+        "--pin-workers",
+        action="store_true",
+        help="Pin each worker (and the engines it runs) to one CPU from the current affinity mask",
+    )
+    run.add_argument("--nice", type=int, default=0, help="Niceness increment applied to workers (e.g. 5)")
     run.add_argument("--engine", choices=["legacy", "rust"], default="legacy", help="Which engine to run")
     run.add_argument("--rnaview-bin", default=None, help="Path to rnaview binary (default: bin/rnaview)")
     run.add_argument(
@@ -860,8 +1159,19 @@ def main(argv: list[str] | None = None) -> int:
         default="stem-hash",
         help="How to derive job_id from input path",
     )
+    run.add_argument(
+        "--hash-algo",
+        choices=["sha1", "blake2b"],
+        default="sha1",
+        help="Hash for the *-hash job_id suffix; sha1 keeps job_ids stable across versions",
+    )
     run.add_argument("--ps", action="store_true", help="Enable legacy -p (produce PS/XML); legacy engine only")
     run.add_argument("--overwrite", action="store_true", help="Overwrite existing outputs")
+    run.add_argument(
+        "--dedupe-identical",
+        action="store_true",
+        help="Run byte-identical inputs once; duplicates repeat the first copy's result with duplicate_of",
+    )
     run.add_argument("--regress", action="store_true", help="Compare against frozen golden_core manifest")
     run.add_argument(
         "--regress-mode",
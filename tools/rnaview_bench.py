@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import hashlib
-import json
+import importlib.util
 import os
+import re
 import shutil
 import statistics
 import subprocess
@@ -13,21 +15,69 @@ import tempfile
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
 
 
+@functools.lru_cache(maxsize=None)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
-def _json_dumps(obj: Any, *, indent: int | None = 2) -> str:
-    if indent is None:
-        return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")) + "\n"
-    return json.dumps(obj, sort_keys=True, ensure_ascii=False, indent=indent) + "\n"
+_RE_GLOB_CHARS = re.compile(r"[*?\[]")
+_RE_PHASE2_INPUT = re.compile(r"\btest/[A-Za-z0-9_./-]+\.(?:pdb|ent|cif)\b")
 
 
 def _has_glob_chars(text: str) -> bool:
-    return any(c in text for c in ("*", "?", "["))
+    return _RE_GLOB_CHARS.search(text) is not None
+
+
+_RNAVIEW_BATCH: Any = None
+
+
+def _load_rnaview_batch():
+    # Shared helpers (e.g. the input tree walker) live in rnaview_batch.
+    global _RNAVIEW_BATCH
+    if _RNAVIEW_BATCH is None:
+        mod_path = _repo_root() / "tools" / "rnaview_batch.py"
+        spec = importlib.util.spec_from_file_location("rnaview_batch", mod_path)
+        assert spec and spec.loader
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = mod
+        spec.loader.exec_module(mod)
+        _RNAVIEW_BATCH = mod
+    return _RNAVIEW_BATCH
+
+
+_RNAVIEW_OUT_CORE: Any = None
+
+
+def _load_rnaview_out_core():
+    # The shared JSON helpers (_json_dumps_bytes/_json_loads_bytes) live in
+    # rnaview_out_core. Bench reports carry floats, which orjson may spell
+    # differently from the stdlib fallback (1e-5 vs 1e-05); values are equal.
+    global _RNAVIEW_OUT_CORE
+    if _RNAVIEW_OUT_CORE is None:
+        mod_path = _repo_root() / "tools" / "rnaview_out_core.py"
+        spec = importlib.util.spec_from_file_location("rnaview_out_core", mod_path)
+        assert spec and spec.loader
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = mod
+        spec.loader.exec_module(mod)
+        _RNAVIEW_OUT_CORE = mod
+    return _RNAVIEW_OUT_CORE
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolved_dir(path: str) -> Path:
+    return Path(path).resolve()
+
+
+def _resolve_input(p: Path) -> Path:
+    # realpath(dir/name) == realpath(dir)/name unless name is itself a symlink, so
+    # inputs sharing a directory pay one lstat each instead of a full realpath walk.
+    if p.name in ("", ".", "..") or p.is_symlink():
+        return p.resolve()
+    return _resolved_dir(str(p.parent)) / p.name
 
 
 def _collect_inputs(items: list[str]) -> list[Path]:
@@ -42,13 +92,11 @@ def _collect_inputs(items: list[str]) -> list[Path]:
 
             matches = sorted(glob.glob(item, recursive=True))
             for m in matches:
-                cand = Path(m)
-                if cand.is_file():
-                    if cand.suffix.lower() not in allowed_exts:
-                        continue
-                    if cand.name.lower().endswith(excluded_name_suffixes):
+                name = os.path.basename(m).lower()
+                if os.path.splitext(name)[1] not in allowed_exts or name.endswith(excluded_name_suffixes):
+                    if os.path.isfile(m):
                         continue
-                out.append(cand)
+                out.append(Path(m))
             continue
 
         p = Path(item)
@@ -56,14 +104,15 @@ def _collect_inputs(items: list[str]) -> list[Path]:
             p = (repo / p).resolve() if (repo / p).exists() else p.resolve()
 
         if p.is_dir():
-            for cand in sorted(p.rglob("*")):
-                if not cand.is_file():
+            found: list[Path] = []
+            for entry in _load_rnaview_batch()._iter_tree_files(str(p)):
+                name = entry.name.lower()
+                if os.path.splitext(name)[1] not in allowed_exts:
                     continue
-                if cand.suffix.lower() not in allowed_exts:
+                if name.endswith(excluded_name_suffixes):
                     continue
-                if cand.name.lower().endswith(excluded_name_suffixes):
-                    continue
-                out.append(cand)
+                found.append(Path(entry.path))
+            out.extend(sorted(found))
             continue
 
         if p.is_file():
@@ -77,7 +126,7 @@ def _collect_inputs(items: list[str]) -> list[Path]:
     uniq: list[Path] = []
     for p in out:
         try:
-            rp = p.resolve()
+            rp = _resolve_input(p)
         except OSError:
             continue
         if rp in seen:
@@ -106,6 +155,14 @@ def _sysroot_env() -> dict[str, str]:
     return env
 
 
+def _bench_base_env() -> dict[str, str]:
+    # Shared by compare and profile so both measure engines the same way.
+    env = dict(os.environ)
+    env.setdefault("OMP_NUM_THREADS", "1")
+    env.setdefault("OPENBLAS_NUM_THREADS", "1")
+    return env
+
+
 def _infer_format(path: Path) -> str | None:
     ext = path.suffix.lower()
     if ext == ".cif":
@@ -115,7 +172,9 @@ def _infer_format(path: Path) -> str | None:
     return None
 
 
-def _engine_flags(fmt: str | None, ps: bool, *, label: bool) -> list[str]:
+@functools.lru_cache(maxsize=8)
+def _engine_flags(fmt: str | None, ps: bool, *, label: bool) -> tuple[str, ...]:
+    # Shared between cases, hence an immutable tuple.
     flags: list[str] = []
     if ps:
         flags.append("-p")
@@ -125,7 +184,7 @@ def _engine_flags(fmt: str | None, ps: bool, *, label: bool) -> list[str]:
         flags.append("--cif")
         if label:
             flags.append("--label")
-    return flags
+    return tuple(flags)
 
 
 _SUITE_PHASE2_FALLBACK = [
@@ -151,12 +210,9 @@ def _load_suite_phase2(repo: Path) -> list[str]:
     if not script.exists():
         return list(_SUITE_PHASE2_FALLBACK)
     text = script.read_text(encoding="utf-8", errors="replace")
-    import re
-
-    pat = re.compile(r"\btest/[A-Za-z0-9_./-]+\.(?:pdb|ent|cif)\b")
     seen: set[str] = set()
     out: list[str] = []
-    for m in pat.finditer(text):
+    for m in _RE_PHASE2_INPUT.finditer(text):
         p = m.group(0)
         if p in seen:
             continue
@@ -171,26 +227,51 @@ def _sha256_bytes(data: bytes) -> str:
     return h.hexdigest()
 
 
+def _hash_out_file(path: Path) -> tuple[str, int]:
+    with path.open("rb") as fh:
+        if hasattr(hashlib, "file_digest"):
+            h = hashlib.file_digest(fh, "sha256")
+        else:
+            h = hashlib.sha256()
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest(), fh.tell()
+
+
+def _prewarm_inputs(paths: Iterable[Path]) -> None:
+    # Pull every input into the page cache before anything is timed, so the first
+    # case does not pay a cold read the later ones skip.
+    buf = bytearray(1 << 20)
+    for path in paths:
+        try:
+            with open(path, "rb", buffering=0) as fh:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                while fh.readinto(buf):
+                    pass
+        except OSError:
+            continue
+
+
+def _case_tag(input_arg: Path) -> str:
+    # Log dir name for one case; only needs to be unique within a bench run.
+    return hashlib.blake2b(input_arg.as_posix().encode("utf-8"), digest_size=6).hexdigest()
+
+
 def _read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
-def _unified_diff(a: str, b: str, *, fromfile: str, tofile: str, max_lines: int) -> list[str]:
+def _unified_diff(a: str | Path, b: str | Path, *, fromfile: str, tofile: str, max_lines: int) -> list[str]:
     import difflib
+    import itertools
 
-    diff = difflib.unified_diff(
-        a.splitlines(),
-        b.splitlines(),
-        fromfile=fromfile,
-        tofile=tofile,
-        lineterm="",
-    )
-    out: list[str] = []
-    for line in diff:
-        out.append(line)
-        if len(out) >= max_lines:
-            break
-    return out
+    # difflib needs both sides as indexable line lists, so files are read whole;
+    # the output side is lazy and only max_lines of it are generated.
+    a_lines = (_read_text(a) if isinstance(a, Path) else a).splitlines()
+    b_lines = (_read_text(b) if isinstance(b, Path) else b).splitlines()
+    diff = difflib.unified_diff(a_lines, b_lines, fromfile=fromfile, tofile=tofile, lineterm="")
+    return list(itertools.islice(diff, max_lines))
 
 
 @dataclass(frozen=True)
@@ -217,19 +298,46 @@ class ProfileSample:
     profile: dict[str, Any]
 
 
-def _summarize_ms(values: list[int]) -> dict[str, Any]:
+@functools.lru_cache(maxsize=None)
+def _optional_numpy() -> Any:
+    # Imported on first need, not at module import: most runs never reach the
+    # large-sample path and should not pay numpy's import time.
+    try:
+        import numpy
+    except ImportError:  # optional; only used to summarize large sample sets
+        return None
+    return numpy
+
+
+def _summarize_ints(values: list[int]) -> dict[str, Any]:
+    # Used for ms timings and for max_rss_kb; the *_ms keys are kept for schema
+    # compatibility. Samples are non-negative ints, so floor division matches
+    # int(statistics.median/mean) without the float round-trips.
     if not values:
         return {}
-    sorted_vals = sorted(values)
+    n = len(values)
+    np = _optional_numpy() if n >= 32 else None
+    vs: Any
+    if np is not None:
+        # Large --runs: sort/sum in C; median and mean still come from exact
+        # integer arithmetic below, so results match the pure-Python path.
+        vs = np.sort(np.asarray(values, dtype=np.int64))
+        total = int(vs.sum())
+    else:
+        vs = sorted(values)
+        total = sum(vs)
+    mid = n // 2
     out: dict[str, Any] = {
-        "n": len(values),
-        "min_ms": int(sorted_vals[0]),
-        "max_ms": int(sorted_vals[-1]),
-        "median_ms": int(statistics.median(sorted_vals)),
-        "mean_ms": int(statistics.mean(sorted_vals)),
+        "n": n,
+        "min_ms": int(vs[0]),
+        "max_ms": int(vs[-1]),
+        "median_ms": int(vs[mid]) if n % 2 else (int(vs[mid - 1]) + int(vs[mid])) // 2,
+        "mean_ms": int(total // n),
     }
-    if len(values) >= 2:
-        out["stdev_ms"] = float(statistics.stdev(sorted_vals))
+    if n >= 2:
+        # Always statistics.stdev, so the reported value does not depend on
+        # whether numpy happens to be installed.
+        out["stdev_ms"] = float(statistics.stdev(values))
     return out
 
 
@@ -244,6 +352,25 @@ def _relative_to_repo_or_name(repo: Path, path: Path) -> Path:
         return Path(path.name)
 
 
+def _reset_staging_dir(work_dir: Path, keep: Path) -> None:
+    # Drop everything earlier runs left behind (.out, side outputs, temp files),
+    # so each run starts from the same tree: only `keep` and its parents remain.
+    keep_dirs = set(keep.parents)
+    for dirpath, dirnames, filenames in os.walk(work_dir, topdown=False):
+        d = Path(dirpath)
+        for name in filenames:
+            if d / name != keep:
+                (d / name).unlink()
+        for name in dirnames:
+            p = d / name
+            if p in keep_dirs:
+                continue
+            if p.is_symlink():
+                p.unlink()
+            else:
+                p.rmdir()
+
+
 def _expected_out_path(work_dir: Path, input_arg: Path) -> Path:
     return work_dir / Path(f"{input_arg.as_posix()}.out")
 
@@ -265,18 +392,20 @@ def _run_one_via_wrapper(
     }
     proc = subprocess.run(
         [sys.executable, str(Path(__file__).resolve()), "_run_one"],
-        input=_json_dumps(spec, indent=None),
+        input=_load_rnaview_out_core()._json_dumps_bytes(spec),
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
         check=False,
     )
     if proc.returncode != 0:
-        raise RuntimeError(f"internal runner failed (code={proc.returncode}):\n{proc.stderr}")
+        stderr_text = proc.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"internal runner failed (code={proc.returncode}):\n{stderr_text}")
     try:
-        data = json.loads(proc.stdout)
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"internal runner produced invalid json: {e}\nstdout={proc.stdout}\nstderr={proc.stderr}") from e
+        data = _load_rnaview_out_core()._json_loads_bytes(proc.stdout)
+    except ValueError as e:
+        stdout_text = proc.stdout.decode("utf-8", errors="replace")
+        stderr_text = proc.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"internal runner produced invalid json: {e}\nstdout={stdout_text}\nstderr={stderr_text}") from e
 
     return RunSample(
         returncode=int(data.get("returncode", -1)),
@@ -287,66 +416,168 @@ def _run_one_via_wrapper(
     )
 
 
+def _run_one_inline(
+    *,
+    cmd: list[str],
+    cwd: Path,
+    env: dict[str, str],
+    timeout_s: float | None,
+    log_path: Path | None,
+) -> RunSample:
+    # os.wait4 reaps exactly this child and returns its own rusage, so samples
+    # stay correct when --jobs runs several engines from this process at once.
+    # os.posix_spawn cannot set a cwd, so this stays on Popen (vfork+exec on
+    # Linux); close_fds=False skips the fd sweep since Python fds are
+    # non-inheritable and the log is handed over as a raw O_CLOEXEC fd.
+    stdout: Any = subprocess.DEVNULL
+    stderr: Any = subprocess.DEVNULL
+    log_fd: int | None = None
+    if log_path is not None:
+        log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o644)
+        stdout = log_fd
+        stderr = subprocess.STDOUT
+
+    start = time.perf_counter()
+    try:
+        proc = subprocess.Popen(cmd, cwd=str(cwd), env=env, stdout=stdout, stderr=stderr, close_fds=False)
+    finally:
+        if log_fd is not None:
+            os.close(log_fd)
+
+    timer = None
+    timed_out = False
+    if timeout_s is not None:
+        import threading
+
+        def _kill() -> None:
+            nonlocal timed_out
+            timed_out = True
+            proc.kill()
+
+        timer = threading.Timer(float(timeout_s), _kill)
+        timer.start()
+    try:
+        _, status, ru = os.wait4(proc.pid, 0)
+    finally:
+        end = time.perf_counter()
+        if timer is not None:
+            timer.cancel()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if timed_out:
+        raise RuntimeError(f"{cmd[0]} timed out after {timeout_s}s")
+
+    return RunSample(
+        returncode=int(proc.returncode),
+        wall_ms=int((end - start) * 1000),
+        user_ms=int(ru.ru_utime * 1000),
+        sys_ms=int(ru.ru_stime * 1000),
+        max_rss_kb=int(ru.ru_maxrss),
+    )
+
+
+def _run_one(
+    *,
+    cmd: list[str],
+    cwd: Path,
+    env: dict[str, str],
+    timeout_s: float | None,
+    log_path: Path | None,
+) -> RunSample:
+    if hasattr(os, "wait4"):
+        return _run_one_inline(cmd=cmd, cwd=cwd, env=env, timeout_s=timeout_s, log_path=log_path)
+    return _run_one_via_wrapper(cmd=cmd, cwd=cwd, env=env, timeout_s=timeout_s, log_path=log_path)
+
+
 def _run_engine_case(
     *,
     engine_name: str,
     engine_bin: Path,
     input_abs: Path,
     input_arg: Path,
-    flags: list[str],
+    flags: tuple[str, ...],
     base_env: dict[str, str],
     sysroot: dict[str, str],
     warmup: int,
     runs: int,
     timeout_s: float | None,
     log_dir: Path | None,
-) -> tuple[list[RunSample], bytes]:
+    verify_out: Path,
+    need_verify_run: bool = True,
+) -> tuple[list[RunSample], str, int]:
     if warmup < 0 or runs <= 0:
         raise ValueError("warmup must be >=0 and runs must be >=1")
 
     repo = _repo_root()
     all_samples: list[RunSample] = []
 
-    verify_out_bytes: bytes | None = None
-
-    total_invocations = 1 + warmup + runs  # 1 verify run (excluded) + warmup + measured runs
-    for idx in range(total_invocations):
-        with tempfile.TemporaryDirectory(prefix=f"rnaview-bench-{engine_name}-") as td:
-            work_dir = Path(td)
-            local_input = work_dir / input_arg
-            _ensure_parent(local_input)
-            shutil.copy2(input_abs, local_input)
+    verify_digest: tuple[str, int] | None = None
 
-            cmd = [str(engine_bin), *flags, input_arg.as_posix()]
+    # Optional verify run (excluded) + warmup + measured runs. Without --verify the
+    # reported digest comes from the last measured run's .out instead.
+    verify_runs = 1 if need_verify_run else 0
+    total_invocations = verify_runs + warmup + runs
+    # One staging dir per (case, engine): the input is copied once, and the dir is
+    # reset to just that input before every run.
+    with tempfile.TemporaryDirectory(prefix=f"rnaview-bench-{engine_name}-") as td:
+        work_dir = Path(td)
+        local_input = work_dir / input_arg
+        _ensure_parent(local_input)
+        shutil.copy2(input_abs, local_input)
+        produced_out = _expected_out_path(work_dir, input_arg)
 
-            env = dict(base_env)
-            env["RNAVIEW"] = str(repo)
-            env["PATH"] = f"{repo / 'bin'}:{env.get('PATH', '')}"
-            env.update(sysroot)
+        cmd = [str(engine_bin), *flags, input_arg.as_posix()]
+        env = dict(base_env)
+        env["RNAVIEW"] = str(repo)
+        env["PATH"] = f"{repo / 'bin'}:{env.get('PATH', '')}"
+        env.update(sysroot)
 
+        if log_dir is not None:
+            log_dir.mkdir(parents=True, exist_ok=True)
+        for idx in range(total_invocations):
             log_path: Path | None = None
             if log_dir is not None:
                 log_path = log_dir / f"{engine_name}.{idx:03d}.log"
-                _ensure_parent(log_path)
 
-            sample = _run_one_via_wrapper(cmd=cmd, cwd=work_dir, env=env, timeout_s=timeout_s, log_path=log_path)
+            _reset_staging_dir(work_dir, local_input)
+            sample = _run_one(cmd=cmd, cwd=work_dir, env=env, timeout_s=timeout_s, log_path=log_path)
 
-            produced_out = _expected_out_path(work_dir, input_arg)
             if not produced_out.exists():
                 raise RuntimeError(f"{engine_name} produced no .out at {produced_out}")
 
             if sample.returncode != 0:
                 raise RuntimeError(f"{engine_name} exited non-zero ({sample.returncode}); see {log_path}" if log_path else "")
 
-            if idx == 0:
-                verify_out_bytes = produced_out.read_bytes()
-                continue
-            if idx <= warmup:
+            if idx < verify_runs or idx == total_invocations - 1:
+                # Keep one .out (not its bytes) for the caller; it is only read
+                # back if the digests disagree and a diff is needed.
+                if verify_digest is None:
+                    shutil.move(produced_out, verify_out)
+                    verify_digest = _hash_out_file(verify_out)
+            if idx < verify_runs + warmup:
                 continue
             all_samples.append(sample)
 
-    assert verify_out_bytes is not None
-    return all_samples, verify_out_bytes
+    assert verify_digest is not None
+    return all_samples, verify_digest[0], verify_digest[1]
+
+
+def _timed_engine_case(**kwargs: Any) -> tuple[list[RunSample], str, int, int, str | None]:
+    # Runs on a --jobs worker thread; failures come back as values so the caller
+    # can report cases in input order.
+    started = time.time()
+    try:
+        samples, out_sha256, out_size = _run_engine_case(**kwargs)
+    except Exception as e:  # noqa: BLE001
+        return [], "", 0, int((time.time() - started) * 1000), str(e)
+    return samples, out_sha256, out_size, int((time.time() - started) * 1000), None
+
+
+def _timed_engine_pair(
+    legacy: dict[str, Any], rustcore: dict[str, Any]
+) -> tuple[tuple[list[RunSample], str, int, int, str | None], tuple[list[RunSample], str, int, int, str | None]]:
+    # Both engines of one case back to back on a single worker, so without
+    # --parallel-engines they never compete with each other for CPU.
+    return _timed_engine_case(**legacy), _timed_engine_case(**rustcore)
 
 
 def _run_engine_profile(
@@ -355,7 +586,7 @@ def _run_engine_profile(
     engine_bin: Path,
     input_abs: Path,
     input_arg: Path,
-    flags: list[str],
+    flags: tuple[str, ...],
     base_env: dict[str, str],
     sysroot: dict[str, str],
     timeout_s: float | None,
@@ -378,7 +609,7 @@ def _run_engine_profile(
         profile_path = work_dir / "profile.json"
         env["RNAVIEW_PROFILE_JSON"] = str(profile_path)
 
-        sample = _run_one_via_wrapper(cmd=cmd, cwd=work_dir, env=env, timeout_s=timeout_s, log_path=log_path)
+        sample = _run_one(cmd=cmd, cwd=work_dir, env=env, timeout_s=timeout_s, log_path=log_path)
 
         produced_out = _expected_out_path(work_dir, input_arg)
         if not produced_out.exists():
@@ -389,8 +620,8 @@ def _run_engine_profile(
         if not profile_path.exists():
             raise RuntimeError(f"{engine_name} produced no profile json at {profile_path}")
         try:
-            prof = json.loads(profile_path.read_text(encoding="utf-8", errors="replace"))
-        except json.JSONDecodeError as e:  # noqa: BLE001
+            prof = _load_rnaview_out_core()._json_loads_bytes(profile_path.read_bytes())
+        except ValueError as e:  # noqa: BLE001
             raise RuntimeError(f"{engine_name} produced invalid profile json: {e}") from e
 
         return ProfileSample(sample=sample, out_bytes=produced_out.read_bytes(), profile=prof)
@@ -409,6 +640,28 @@ def _fmt_ms(ns: int | float | None) -> str:
     return f"{v:.3f}ms"
 
 
+def _stage_speedups(
+    legacy_t: dict[str, Any],
+    rust_t: dict[str, Any],
+    keys: Iterable[str],
+) -> list[tuple[str, Any, Any, float | None]]:
+    # One (stage, legacy_ns, rustcore_ns, speedup) row per key; shared by the
+    # stage and substage tables of profile.
+    rows: list[tuple[str, Any, Any, float | None]] = []
+    for k in keys:
+        l = legacy_t.get(k)
+        r = rust_t.get(k)
+        speed = (float(l) / float(r)) if isinstance(l, (int, float)) and isinstance(r, (int, float)) and r else None
+        rows.append((k, l, r, speed))
+    return rows
+
+
+def _write_stage_rows(rows: Iterable[tuple[str, Any, Any, float | None]]) -> None:
+    for k, l, r, speed in rows:
+        speed_s = f"{speed:.2f}x" if speed is not None else "n/a"
+        sys.stderr.write(f"  {k}: legacy={_fmt_ms(l)} rustcore={_fmt_ms(r)} speedup={speed_s}\n")
+
+
 def _cmd_profile(args: argparse.Namespace) -> int:
     repo = _repo_root()
     input_abs = Path(args.input).resolve() if args.input else None
@@ -436,14 +689,14 @@ def _cmd_profile(args: argparse.Namespace) -> int:
     verify = str(args.verify)
     keep_logs = bool(args.keep_logs)
     sysroot = _sysroot_env()
-    base_env = dict(os.environ)
+    base_env = _bench_base_env()
 
     log_root: Path | None = None
     if keep_logs:
         log_root = Path(args.log_dir).resolve() if args.log_dir else (repo / "out" / "bench_logs")
         log_root.mkdir(parents=True, exist_ok=True)
 
-    case_log_dir = log_root / _sha256_bytes(input_arg.as_posix().encode("utf-8"))[:12] if log_root else None
+    case_log_dir = log_root / _case_tag(input_arg) if log_root else None
     if case_log_dir is not None:
         case_log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -527,12 +780,7 @@ def _cmd_profile(args: argparse.Namespace) -> int:
     ]
 
     sys.stderr.write("stage timings (legacy vs rustcore)\n")
-    for k in stages:
-        l = legacy_t.get(k)
-        r = rust_t.get(k)
-        speed = (float(l) / float(r)) if isinstance(l, (int, float)) and isinstance(r, (int, float)) and r else None
-        speed_s = f"{speed:.2f}x" if speed is not None else "n/a"
-        sys.stderr.write(f"  {k}: legacy={_fmt_ms(l)} rustcore={_fmt_ms(r)} speedup={speed_s}\n")
+    _write_stage_rows(_stage_speedups(legacy_t, rust_t, stages))
 
     sub_stages = [
         "all_pairs_hbond_pair_h_catalog",
@@ -540,12 +788,7 @@ def _cmd_profile(args: argparse.Namespace) -> int:
     ]
     if any((k in legacy_t) or (k in rust_t) for k in sub_stages):
         sys.stderr.write("substage timings (legacy vs rustcore)\n")
-        for k in sub_stages:
-            l = legacy_t.get(k)
-            r = rust_t.get(k)
-            speed = (float(l) / float(r)) if isinstance(l, (int, float)) and isinstance(r, (int, float)) and r else None
-            speed_s = f"{speed:.2f}x" if speed is not None else "n/a"
-            sys.stderr.write(f"  {k}: legacy={_fmt_ms(l)} rustcore={_fmt_ms(r)} speedup={speed_s}\n")
+        _write_stage_rows(_stage_speedups(legacy_t, rust_t, sub_stages))
 
     def _slowest_stage(times: dict[str, Any]) -> tuple[str, int] | None:
         best: tuple[str, int] | None = None
@@ -584,7 +827,7 @@ def _cmd_profile(args: argparse.Namespace) -> int:
                 "out_sha256": _sha256_bytes(rustcore.out_bytes),
             },
         }
-        Path(args.json).write_text(_json_dumps(out, indent=2), encoding="utf-8")
+        Path(args.json).write_bytes(_load_rnaview_out_core()._json_dumps_bytes(out, indent=2))
 
     if verify_ok is False:
         return 1
@@ -603,6 +846,8 @@ def _cmd_compare(args: argparse.Namespace) -> int:
     if not inputs:
         sys.stderr.write("no inputs\n")
         return 2
+    if args.prewarm:
+        _prewarm_inputs(inputs)
 
     legacy_bin = Path(args.legacy_bin).resolve() if args.legacy_bin else (repo / "bin" / "rnaview")
     rustcore_bin = Path(args.rustcore_bin).resolve() if args.rustcore_bin else (repo / "bin" / "rnaview_rustcore")
@@ -619,8 +864,35 @@ def _cmd_compare(args: argparse.Namespace) -> int:
     verify = str(args.verify)
     keep_logs = bool(args.keep_logs)
 
+    # Affinity and niceness are per-thread on Linux; setting them here, before the
+    # --jobs pool exists, lets every worker thread and engine child inherit them.
+    pin_cpu = args.pin_cpu
+    if pin_cpu is not None:
+        if not hasattr(os, "sched_setaffinity"):
+            sys.stderr.write("--pin-cpu is not supported on this platform\n")
+            return 2
+        # The whole process (every worker and engine child) shares the one CPU,
+        # so concurrent engine runs would timeshare it and inflate wall times.
+        if int(args.jobs) != 1 or args.parallel_engines:
+            sys.stderr.write("--pin-cpu requires --jobs 1 and no --parallel-engines\n")
+            return 2
+        if pin_cpu not in os.sched_getaffinity(0):
+            sys.stderr.write(f"--pin-cpu {pin_cpu} is not in this process's CPU set\n")
+            return 2
+        os.sched_setaffinity(0, {pin_cpu})
+    if args.nice:
+        try:
+            os.nice(int(args.nice))
+        except PermissionError:
+            sys.stderr.write(f"--nice {args.nice} needs privileges this process does not have\n")
+            return 2
+
     sysroot = _sysroot_env()
-    base_env = dict(os.environ)
+    base_env = _bench_base_env()
+
+    warnings: list[str] = []
+    if sys.platform.startswith("linux") and pin_cpu is None:
+        warnings.append("not pinned to a CPU (--pin-cpu); wall times include scheduler migration noise")
 
     out: dict[str, Any] = {
         "schema_version": 1,
@@ -629,12 +901,17 @@ def _cmd_compare(args: argparse.Namespace) -> int:
             "argv": sys.argv[1:],
             "python": sys.version.splitlines()[0],
             "platform": sys.platform,
+            "warnings": warnings,
         },
         "config": {
             "warmup": warmup,
             "runs": runs,
             "timeout_s": timeout_s,
             "verify": verify,
+            "jobs": max(1, int(args.jobs)),
+            "parallel_engines": bool(args.parallel_engines),
+            "pin_cpu": pin_cpu,
+            "nice": int(args.nice),
         },
         "engines": {
             "legacy": {"bin": str(legacy_bin)},
@@ -648,7 +925,7 @@ def _cmd_compare(args: argparse.Namespace) -> int:
         log_root = Path(args.log_dir).resolve() if args.log_dir else (repo / "out" / "bench_logs")
         log_root.mkdir(parents=True, exist_ok=True)
 
-    failures = 0
+    cases: list[tuple[Path, Path, str, tuple[str, ...], Path | None]] = []
     for input_abs in inputs:
         fmt = _infer_format(input_abs)
         if fmt is None:
@@ -656,144 +933,177 @@ def _cmd_compare(args: argparse.Namespace) -> int:
         input_arg = _relative_to_repo_or_name(repo, input_abs)
         flags = _engine_flags(fmt, bool(args.ps), label=bool(args.label))
 
-        case_log_dir = (log_root / _sha256_bytes(input_arg.as_posix().encode("utf-8"))[:12]) if log_root else None
+        case_log_dir = (log_root / _case_tag(input_arg)) if log_root else None
         if case_log_dir is not None:
             case_log_dir.mkdir(parents=True, exist_ok=True)
-
-        started = time.time()
-        try:
-            legacy_samples, legacy_out = _run_engine_case(
-                engine_name="legacy",
-                engine_bin=legacy_bin,
-                input_abs=input_abs,
-                input_arg=input_arg,
-                flags=flags,
-                base_env=base_env,
-                sysroot={},
-                warmup=warmup,
-                runs=runs,
-                timeout_s=timeout_s,
-                log_dir=case_log_dir if keep_logs else None,
-            )
-            rustcore_samples, rustcore_out = _run_engine_case(
-                engine_name="rustcore",
-                engine_bin=rustcore_bin,
-                input_abs=input_abs,
-                input_arg=input_arg,
-                flags=flags,
-                base_env=base_env,
-                sysroot=sysroot,
-                warmup=warmup,
-                runs=runs,
-                timeout_s=timeout_s,
-                log_dir=case_log_dir if keep_logs else None,
-            )
-        except Exception as e:  # noqa: BLE001
-            failures += 1
-            out["cases"].append(
-                {
-                    "input": str(input_abs),
-                    "input_arg": input_arg.as_posix(),
-                    "format": fmt,
-                    "error": str(e),
-                    "elapsed_ms": int((time.time() - started) * 1000),
-                }
+        cases.append((input_abs, input_arg, fmt, flags, case_log_dir))
+
+    import concurrent.futures
+
+    jobs = max(1, int(args.jobs))
+    verify_root = Path(tempfile.mkdtemp(prefix="rnaview-bench-verify-"))
+    ex = concurrent.futures.ThreadPoolExecutor(max_workers=jobs)
+    # One task per case runs legacy then rustcore; only --parallel-engines splits
+    # a case into two tasks so its engines may overlap (and compete for CPU).
+    futs: list[list[Any]] = []
+    for case_idx, (input_abs, input_arg, _fmt, flags, case_log_dir) in enumerate(cases):
+        common = {
+            "input_abs": input_abs,
+            "input_arg": input_arg,
+            "flags": flags,
+            "base_env": base_env,
+            "warmup": warmup,
+            "runs": runs,
+            "timeout_s": timeout_s,
+            "log_dir": case_log_dir if keep_logs else None,
+            "need_verify_run": verify != "none",
+        }
+        legacy_kwargs = {
+            "engine_name": "legacy",
+            "engine_bin": legacy_bin,
+            "sysroot": {},
+            "verify_out": verify_root / f"{case_idx:04d}.legacy.out",
+            **common,
+        }
+        rustcore_kwargs = {
+            "engine_name": "rustcore",
+            "engine_bin": rustcore_bin,
+            "sysroot": sysroot,
+            "verify_out": verify_root / f"{case_idx:04d}.rustcore.out",
+            **common,
+        }
+        if args.parallel_engines:
+            futs.append(
+                [
+                    ex.submit(_timed_engine_case, **legacy_kwargs),
+                    ex.submit(_timed_engine_case, **rustcore_kwargs),
+                ]
             )
-            if not args.keep_going:
-                break
-            continue
+        else:
+            futs.append([ex.submit(_timed_engine_pair, legacy_kwargs, rustcore_kwargs)])
 
-        verify_ok: bool | None = None
-        verify_diffs: list[str] | None = None
-        if verify == "none":
-            verify_ok = None
-        elif verify == "between":
-            verify_ok = legacy_out == rustcore_out
-            if not verify_ok:
-                verify_diffs = _unified_diff(
-                    legacy_out.decode("utf-8", errors="replace"),
-                    rustcore_out.decode("utf-8", errors="replace"),
-                    fromfile="legacy.out",
-                    tofile="rustcore.out",
-                    max_lines=int(args.max_diffs),
+    failures = 0
+    try:
+        for case_idx, ((input_abs, input_arg, fmt, flags, _log_dir), case_futs) in enumerate(zip(cases, futs)):
+            if len(case_futs) == 1:
+                legacy_res, rust_res = case_futs[0].result()
+            else:
+                legacy_res, rust_res = (f.result() for f in case_futs)
+            legacy_samples, legacy_sha256, legacy_size, legacy_ms, legacy_err = legacy_res
+            rustcore_samples, rustcore_sha256, rustcore_size, rust_ms, rust_err = rust_res
+            legacy_out = verify_root / f"{case_idx:04d}.legacy.out"
+            rustcore_out = verify_root / f"{case_idx:04d}.rustcore.out"
+            elapsed_ms = legacy_ms + rust_ms
+            error = legacy_err if legacy_err is not None else rust_err
+            if error is not None:
+                failures += 1
+                out["cases"].append(
+                    {
+                        "input": str(input_abs),
+                        "input_arg": input_arg.as_posix(),
+                        "format": fmt,
+                        "error": error,
+                        "elapsed_ms": elapsed_ms,
+                    }
                 )
-        elif verify == "golden":
-            golden_path = (repo / input_arg).with_suffix(f"{input_arg.suffix}.out")
-            if not golden_path.exists():
+                if not args.keep_going:
+                    break
+                continue
+
+            verify_ok: bool | None = None
+            verify_diffs: list[str] | None = None
+            if verify == "none":
                 verify_ok = None
-            else:
-                golden_bytes = golden_path.read_bytes()
-                ok_legacy = legacy_out == golden_bytes
-                ok_rustcore = rustcore_out == golden_bytes
-                verify_ok = ok_legacy and ok_rustcore
+            elif verify == "between":
+                verify_ok = legacy_sha256 == rustcore_sha256
                 if not verify_ok:
                     verify_diffs = _unified_diff(
-                        golden_bytes.decode("utf-8", errors="replace"),
-                        legacy_out.decode("utf-8", errors="replace"),
-                        fromfile="golden.out",
-                        tofile="legacy.out",
+                        legacy_out,
+                        rustcore_out,
+                        fromfile="legacy.out",
+                        tofile="rustcore.out",
                         max_lines=int(args.max_diffs),
                     )
-        else:
-            raise ValueError(f"unknown verify mode: {verify}")
-
-        legacy_wall = [s.wall_ms for s in legacy_samples]
-        rust_wall = [s.wall_ms for s in rustcore_samples]
-        legacy_median = statistics.median(legacy_wall) if legacy_wall else None
-        rust_median = statistics.median(rust_wall) if rust_wall else None
-        speedup = (float(legacy_median) / float(rust_median)) if legacy_median and rust_median else None
-
-        case = {
-            "input": str(input_abs),
-            "input_arg": input_arg.as_posix(),
-            "format": fmt,
-            "flags": flags,
-            "verify": {"mode": verify, "ok": verify_ok, "diffs": verify_diffs},
-            "elapsed_ms": int((time.time() - started) * 1000),
-            "runs": {
-                "legacy": {
-                    "bin": str(legacy_bin),
-                    "samples": [s.__dict__ for s in legacy_samples],
-                    "summary": {
-                        "wall_ms": _summarize_ms([s.wall_ms for s in legacy_samples]),
-                        "user_ms": _summarize_ms([s.user_ms for s in legacy_samples]),
-                        "sys_ms": _summarize_ms([s.sys_ms for s in legacy_samples]),
-                        "max_rss_kb": _summarize_ms([s.max_rss_kb for s in legacy_samples if s.max_rss_kb is not None]),
+            elif verify == "golden":
+                golden_path = (repo / input_arg).with_suffix(f"{input_arg.suffix}.out")
+                if not golden_path.exists():
+                    verify_ok = None
+                else:
+                    golden_sha256, _ = _hash_out_file(golden_path)
+                    ok_legacy = legacy_sha256 == golden_sha256
+                    ok_rustcore = rustcore_sha256 == golden_sha256
+                    verify_ok = ok_legacy and ok_rustcore
+                    if not verify_ok:
+                        verify_diffs = _unified_diff(
+                            golden_path,
+                            legacy_out,
+                            fromfile="golden.out",
+                            tofile="legacy.out",
+                            max_lines=int(args.max_diffs),
+                        )
+            else:
+                raise ValueError(f"unknown verify mode: {verify}")
+
+            legacy_wall = [s.wall_ms for s in legacy_samples]
+            rust_wall = [s.wall_ms for s in rustcore_samples]
+            legacy_median = statistics.median(legacy_wall) if legacy_wall else None
+            rust_median = statistics.median(rust_wall) if rust_wall else None
+            speedup = (float(legacy_median) / float(rust_median)) if legacy_median and rust_median else None
+
+            case = {
+                "input": str(input_abs),
+                "input_arg": input_arg.as_posix(),
+                "format": fmt,
+                "flags": flags,
+                "verify": {"mode": verify, "ok": verify_ok, "diffs": verify_diffs},
+                "elapsed_ms": elapsed_ms,
+                "runs": {
+                    "legacy": {
+                        "bin": str(legacy_bin),
+                        "samples": [s.__dict__ for s in legacy_samples],
+                        "summary": {
+                            "wall_ms": _summarize_ints([s.wall_ms for s in legacy_samples]),
+                            "user_ms": _summarize_ints([s.user_ms for s in legacy_samples]),
+                            "sys_ms": _summarize_ints([s.sys_ms for s in legacy_samples]),
+                            "max_rss_kb": _summarize_ints([s.max_rss_kb for s in legacy_samples if s.max_rss_kb is not None]),
+                        },
+                        "out_sha256": legacy_sha256,
+                        "out_bytes": legacy_size,
                     },
-                    "out_sha256": _sha256_bytes(legacy_out),
-                    "out_bytes": len(legacy_out),
-                },
-                "rustcore": {
-                    "bin": str(rustcore_bin),
-                    "samples": [s.__dict__ for s in rustcore_samples],
-                    "summary": {
-                        "wall_ms": _summarize_ms([s.wall_ms for s in rustcore_samples]),
-                        "user_ms": _summarize_ms([s.user_ms for s in rustcore_samples]),
-                        "sys_ms": _summarize_ms([s.sys_ms for s in rustcore_samples]),
-                        "max_rss_kb": _summarize_ms([s.max_rss_kb for s in rustcore_samples if s.max_rss_kb is not None]),
+                    "rustcore": {
+                        "bin": str(rustcore_bin),
+                        "samples": [s.__dict__ for s in rustcore_samples],
+                        "summary": {
+                            "wall_ms": _summarize_ints([s.wall_ms for s in rustcore_samples]),
+                            "user_ms": _summarize_ints([s.user_ms for s in rustcore_samples]),
+                            "sys_ms": _summarize_ints([s.sys_ms for s in rustcore_samples]),
+                            "max_rss_kb": _summarize_ints([s.max_rss_kb for s in rustcore_samples if s.max_rss_kb is not None]),
+                        },
+                        "out_sha256": rustcore_sha256,
+                        "out_bytes": rustcore_size,
                     },
-                    "out_sha256": _sha256_bytes(rustcore_out),
-                    "out_bytes": len(rustcore_out),
                 },
-            },
-            "comparison": {"speedup_median": speedup},
-        }
-        out["cases"].append(case)
-
-        legacy_line = case["runs"]["legacy"]["summary"]["wall_ms"].get("median_ms")
-        rust_line = case["runs"]["rustcore"]["summary"]["wall_ms"].get("median_ms")
-        speed_line = f"{speedup:.2f}x" if speedup is not None else "n/a"
-        sys.stderr.write(f"{input_arg.as_posix()}: legacy={legacy_line}ms rustcore={rust_line}ms speedup={speed_line}\n")
-
-        if verify_ok is False:
-            failures += 1
-            if not args.keep_going:
-                break
+                "comparison": {"speedup_median": speedup},
+            }
+            out["cases"].append(case)
+
+            legacy_line = case["runs"]["legacy"]["summary"]["wall_ms"].get("median_ms")
+            rust_line = case["runs"]["rustcore"]["summary"]["wall_ms"].get("median_ms")
+            speed_line = f"{speedup:.2f}x" if speedup is not None else "n/a"
+            sys.stderr.write(f"{input_arg.as_posix()}: legacy={legacy_line}ms rustcore={rust_line}ms speedup={speed_line}\n")
+
+            if verify_ok is False:
+                failures += 1
+                if not args.keep_going:
+                    break
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(verify_root, ignore_errors=True)
 
     out["totals"] = {"cases": len(out["cases"]), "failures": failures}
 
     if args.json:
-        Path(args.json).write_text(_json_dumps(out, indent=2), encoding="utf-8")
+        Path(args.json).write_bytes(_load_rnaview_out_core()._json_dumps_bytes(out, indent=2))
 
     if failures:
         return 1
@@ -803,7 +1113,7 @@ def _cmd_compare(args: argparse.Namespace) -> int:
 def _cmd_run_one(args: argparse.Namespace) -> int:
     import resource
 
-    spec = json.loads(sys.stdin.read() or "{}")
+    spec = _load_rnaview_out_core()._json_loads_bytes(sys.stdin.buffer.read() or b"{}")
     cmd = list(spec.get("cmd") or [])
     cwd = spec.get("cwd")
     env = spec.get("env")
@@ -848,7 +1158,7 @@ def _cmd_run_one(args: argparse.Namespace) -> int:
         "sys_ms": int(ru.ru_stime * 1000),
         "max_rss_kb": int(getattr(ru, "ru_maxrss", 0)) if getattr(ru, "ru_maxrss", None) is not None else None,
     }
-    sys.stdout.write(_json_dumps(result, indent=None))
+    sys.stdout.buffer.write(_load_rnaview_out_core()._json_dumps_bytes(result))
     return 0
 
 
@@ -864,6 +1174,35 @@ def main(argv: list[str] | None = None) -> int:
     compare.add_argument("--warmup", type=int, default=0, help="Warmup runs per case/engine (not counted)")
     compare.add_argument("--runs", type=int, default=1, help="Measured runs per case/engine")
     compare.add_argument("--timeout", type=float, default=None, help="Per-run timeout seconds")
+    compare.add_argument(
+        "--jobs",
+        type=int,
+        default=max(1, (os.cpu_count() or 1) // 2),
+        help="Engine cases to run concurrently (default: half the CPUs); use 1 for timing-sensitive runs",
+    )
+    compare.add_argument(
+        "--parallel-engines",
+        action="store_true",
+        help="Run legacy and rustcore of each case at the same time (faster turnaround, noisier timings)",
+    )
+    compare.add_argument(
+        "--pin-cpu",
+        type=int,
+        default=None,
+        help="Pin the harness and engines to this CPU (requires --jobs 1, no --parallel-engines)",
+    )
+    compare.add_argument(
+        "--nice",
+        type=int,
+        default=0,
+        help="Niceness increment for the harness and engines (negative needs privileges)",
+    )
+    compare.add_argument(
+        "--prewarm",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Read all inputs into the page cache before timing (default: on)",
+    )
     compare.add_argument("--ps", action="store_true", help="Enable -p (PS/XML); not recommended for benchmarking")
     compare.add_argument("--label", action="store_true", help="For mmCIF: use --label parsing (default: auth)")
     compare.add_argument(
@@ -2,223 +2,303 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator, NamedTuple
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
 
-_RE_BEGIN_BASE_PAIR = re.compile(r"^\s*BEGIN_base-pair\s*$")
-_RE_END_BASE_PAIR = re.compile(r"^\s*END_base-pair\s*$")
-_RE_BEGIN_MULTIPLETS = re.compile(r"^\s*BEGIN_multiplets\s*$")
-_RE_END_MULTIPLETS = re.compile(r"^\s*END_multiplets\s*$")
+
+_BEGIN_BASE_PAIR = "BEGIN_base-pair"
+_END_BASE_PAIR = "END_base-pair"
+_BEGIN_MULTIPLETS = "BEGIN_multiplets"
+_END_MULTIPLETS = "END_multiplets"
+
+# Compiled once at import; _scan_out_lines() binds .match/.fullmatch locally
+# so the per-line path never goes through re's pattern cache.
 _RE_TOTAL = re.compile(
     r"^\s*The total base pairs\s*=\s*(\d+)\s*\(from\s*(\d+)\s*bases\)\s*$",
     re.IGNORECASE,
 )
-_RE_SEPARATOR = re.compile(r"^\s*-{5,}\s*$")
-
-_RE_PAIR_LINE = re.compile(
-    r"^\s*(\d+)_(\d+),\s*(.):\s*([0-9]+)\s+(\S)-(\S)\s+([0-9]+)\s+(.):\s*(.*?)\s*$"
-)
-
-
-def _norm_ws(text: str) -> str:
-    return " ".join(text.strip().split())
-
-
-def _norm_orientation(token: str | None) -> str | None:
-    if token is None:
-        return None
-    t = token.strip().lower()
-    if t == "cis":
-        return "cis"
-    if t.startswith("tran"):
-        return "tran"
-    return t
-
-
-@dataclass(frozen=True)
-class BasePairRecord:
+# A whole row of integer counts, matched in one pass instead of one
+# fullmatch per whitespace-separated token.
+_RE_INT_ROW = re.compile(r"-?\d+(?:\s+-?\d+)*")
+
+# Lower-cased orientation tokens in the pair annotation -> canonical value.
+_ORIENTATIONS = {"cis": "cis", "tran": "tran", "trans": "tran"}
+
+
+# JSON helpers shared by the other tools, which load this module anyway.
+def _json_dumps_bytes(obj: Any, *, indent: int | None = None) -> bytes:
+    # orjson output matches the stdlib form below byte for byte as long as the
+    # payload holds only str/int/bool/None/list/dict values (cores, manifests,
+    # pairs.json, results). Floats are equal in value but orjson may spell them
+    # differently (1e-5 vs 1e-05).
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent is None:
+        text = json.dumps(obj, sort_keys=True, ensure_ascii=False, check_circular=False, separators=(",", ":"))
+    else:
+        text = json.dumps(obj, sort_keys=True, ensure_ascii=False, check_circular=False, indent=indent)
+    return (text + "\n").encode("utf-8")
+
+
+def _json_loads_bytes(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _BasePair(NamedTuple):
+    # Field order is the canonical sort order, so records sort as plain tuples.
+    # Unset optional fields are ""/0 here and omitted by _bp_to_json().
     i: int
     j: int
+    kind: str  # "pair" | "stacked" | "unknown"
     chain_i: str
     resseq_i: int
     base_i: str
     base_j: str
     resseq_j: int
     chain_j: str
-    kind: str  # "pair" | "stacked" | "unknown"
-    lw: str | None = None
-    orientation: str | None = None
-    syn: int = 0
-    note: str | None = None
-    text: str | None = None  # only for kind=="unknown"
-
-    def to_json(self) -> dict[str, Any]:
-        out: dict[str, Any] = {
-            "i": self.i,
-            "j": self.j,
-            "chain_i": self.chain_i,
-            "resseq_i": self.resseq_i,
-            "base_i": self.base_i,
-            "base_j": self.base_j,
-            "resseq_j": self.resseq_j,
-            "chain_j": self.chain_j,
-            "kind": self.kind,
-        }
-        if self.kind == "unknown":
-            out["text"] = self.text or ""
-            return out
-        if self.lw is not None:
-            out["lw"] = self.lw
-        if self.orientation is not None:
-            out["orientation"] = self.orientation
-        if self.syn:
-            out["syn"] = self.syn
-        if self.note is not None:
-            out["note"] = self.note
-        return out
+    lw: str
+    orientation: str
+    syn: int
+    note: str
+    text: str  # only for kind=="unknown"
 
 
-@dataclass(frozen=True)
-class MultipletRecord:
+class _Multiplet(NamedTuple):
     indices: tuple[int, ...]
     text: str
 
-    def to_json(self) -> dict[str, Any]:
-        return {"indices": list(self.indices), "text": self.text}
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    # Unbuffered open/write/close for an already encoded payload (same 0o666 &
+    # ~umask mode as Path.write_bytes).
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _read_bytes(path: Path) -> bytes:
+    # Unbuffered counterpart of _write_bytes: one read sized from fstat, looping
+    # only if the file is short-read or grew since.
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        chunks = [os.read(fd, os.fstat(fd).st_size + 1)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, 64 * 1024))
+    finally:
+        os.close(fd)
+    return b"".join(chunks)
+
+
+def _norm_ws(text: str) -> str:
+    return " ".join(text.strip().split())
 
 
 def _parse_pair_rest(rest: str) -> tuple[str, str | None, int, str | None, str]:
-    text = _norm_ws(rest)
-    if not text:
+    tokens = rest.split()
+    if not tokens:
         return "", None, 0, None, ""
 
-    tokens = text.split()
-
-    if tokens and tokens[-1].lower() == "stacked":
+    last = tokens[-1]
+    if last == "stacked" or last.lower() == "stacked":
         syn_count = sum(1 for t in tokens if t.lower() == "syn")
         return "stacked", None, syn_count, None, "stacked"
 
-    lw = tokens[0] if tokens else ""
+    lw = tokens[0]
     orientation = None
     syn_count = 0
     note_tokens: list[str] = []
 
+    orientations = _ORIENTATIONS
     for t in tokens[1:]:
         tl = t.lower()
-        if tl in ("cis", "tran", "trans"):
-            orientation = _norm_orientation(tl)
+        o = orientations.get(tl)
+        if o is not None:
+            orientation = o
             continue
         if tl == "syn":
             syn_count += 1
             continue
         note_tokens.append(t)
 
-    note = " ".join(note_tokens).strip() or None
+    note = " ".join(note_tokens) or None
     return "pair", orientation, syn_count, note, lw
 
 
-def _parse_base_pair_line(line: str) -> BasePairRecord | None:
-    m = _RE_PAIR_LINE.match(line)
-    if not m:
+def _parse_base_pair_line(line: str) -> _BasePair | None:
+    # Hand-rolled equivalent of
+    #   ^\s*(\d+)_(\d+),\s*(.):\s*([0-9]+)\s+(\S)-(\S)\s+([0-9]+)\s+(.):\s*(.*?)\s*$
+    # A chain id may itself be a blank ("1_2,  : ..."), so it is the character
+    # right before the ':' that follows the leading whitespace.
+    head, sep, tail = line.partition(",")
+    if not sep:
+        return None
+    i_s, sep, j_s = head.lstrip().partition("_")
+    if not sep or not i_s.isdecimal() or not j_s.isdecimal():
         return None
 
-    i = int(m.group(1))
-    j = int(m.group(2))
-    chain_i = m.group(3)
-    resseq_i = int(m.group(4))
-    base_i = m.group(5)
-    base_j = m.group(6)
-    resseq_j = int(m.group(7))
-    chain_j = m.group(8)
-    rest = m.group(9)
-
-    kind, orientation, syn_count, note, lw = _parse_pair_rest(rest)
-    if kind == "stacked":
-        return BasePairRecord(
-            i=i,
-            j=j,
-            chain_i=chain_i,
-            resseq_i=resseq_i,
-            base_i=base_i,
-            base_j=base_j,
-            resseq_j=resseq_j,
-            chain_j=chain_j,
-            kind="stacked",
-            syn=syn_count,
-        )
+    k = len(tail) - len(tail.lstrip())
+    if tail[k + 1 : k + 2] == ":":
+        chain_i = tail[k]
+        tail = tail[k + 2 :]
+    elif k and tail[k : k + 1] == ":":
+        chain_i = tail[k - 1]
+        tail = tail[k + 1 :]
+    else:
+        return None
 
-    return BasePairRecord(
-        i=i,
-        j=j,
-        chain_i=chain_i,
-        resseq_i=resseq_i,
-        base_i=base_i,
-        base_j=base_j,
-        resseq_j=resseq_j,
-        chain_j=chain_j,
-        kind="pair",
-        lw=lw or None,
-        orientation=orientation,
-        syn=syn_count,
-        note=note,
-    )
+    parts = tail.split(None, 3)
+    if len(parts) != 4:
+        return None
+    resseq_i_s, bases, resseq_j_s, after = parts
+    if not (resseq_i_s.isascii() and resseq_i_s.isdigit() and resseq_j_s.isascii() and resseq_j_s.isdigit()):
+        return None
+    if len(bases) != 3 or bases[1] != "-":
+        return None
 
+    if after[1:2] == ":":
+        chain_j = after[0]
+        rest = after[2:]
+    elif after[:1] == ":" and tail[len(tail) - len(after) - 2].isspace():
+        chain_j = tail[len(tail) - len(after) - 1]
+        rest = after[1:]
+    else:
+        return None
 
-def _extract_block(lines: list[str], begin_re: re.Pattern[str], end_re: re.Pattern[str]) -> list[str]:
-    in_block = False
-    out: list[str] = []
-    for line in lines:
-        if not in_block:
-            if begin_re.match(line):
-                in_block = True
-            continue
-        if end_re.match(line):
-            break
-        out.append(line.rstrip("\n"))
-    return out
+    i = int(i_s)
+    j = int(j_s)
+    resseq_i = int(resseq_i_s)
+    base_i = bases[0]
+    base_j = bases[2]
+    resseq_j = int(resseq_j_s)
 
+    kind, orientation, syn_count, note, lw = _parse_pair_rest(rest)
+    if kind != "stacked":
+        kind = "pair"
+    else:
+        # _parse_pair_rest reports "stacked" itself as the lw token of stacked lines.
+        lw = ""
+    return _BasePair(
+        i,
+        j,
+        kind,
+        chain_i,
+        resseq_i,
+        base_i,
+        base_j,
+        resseq_j,
+        chain_j,
+        lw,
+        orientation or "",
+        syn_count,
+        note or "",
+        "",
+    )
 
-def _extract_stats(lines: list[str]) -> dict[str, Any]:
-    stats: dict[str, Any] = {}
 
-    total_idx = None
-    total_pairs = None
-    total_bases = None
-    for idx, line in enumerate(lines):
-        m = _RE_TOTAL.match(line.rstrip("\n"))
-        if m:
-            total_pairs = int(m.group(1))
-            total_bases = int(m.group(2))
-            total_idx = idx
-            break
+def _bp_to_json(bp: _BasePair) -> dict[str, Any]:
+    out: dict[str, Any] = {
+        "i": bp.i,
+        "j": bp.j,
+        "chain_i": bp.chain_i,
+        "resseq_i": bp.resseq_i,
+        "base_i": bp.base_i,
+        "base_j": bp.base_j,
+        "resseq_j": bp.resseq_j,
+        "chain_j": bp.chain_j,
+        "kind": bp.kind,
+    }
+    if bp.kind == "unknown":
+        out["text"] = bp.text
+        return out
+    if bp.lw:
+        out["lw"] = bp.lw
+    if bp.orientation:
+        out["orientation"] = bp.orientation
+    if bp.syn:
+        out["syn"] = bp.syn
+    if bp.note:
+        out["note"] = bp.note
+    return out
 
-    if total_pairs is None or total_bases is None or total_idx is None:
-        return stats
 
-    stats["total_pairs"] = total_pairs
-    stats["total_bases"] = total_bases
+def _scan_out_lines(lines: Iterable[str]) -> tuple[list[str] | None, list[str], dict[str, Any]]:
+    # One forward pass over the file. The base-pair block, the multiplet block
+    # and the stats tail are tracked independently (each "pre" -> "in" ->
+    # "done"), exactly as if each had been scanned on its own.
+    bp_state = "pre"
+    mult_state = "pre"
+    stats_state = "pre"
+    base_pair_lines: list[str] = []
+    multiplet_lines: list[str] = []
 
+    stats: dict[str, Any] = {}
     pair_type_counts: dict[str, int] = {}
     pending_header: list[str] | None = None
+    total_match = _RE_TOTAL.match
+    int_row_fullmatch = _RE_INT_ROW.fullmatch
+
+    for line in lines:
+        if bp_state != "done" or mult_state != "done":
+            s = line.strip()
+            if bp_state == "in":
+                if s == _END_BASE_PAIR:
+                    bp_state = "done"
+                else:
+                    base_pair_lines.append(line)
+            elif bp_state == "pre" and s == _BEGIN_BASE_PAIR:
+                bp_state = "in"
+            if mult_state == "in":
+                if s == _END_MULTIPLETS:
+                    mult_state = "done"
+                else:
+                    multiplet_lines.append(line)
+            elif mult_state == "pre" and s == _BEGIN_MULTIPLETS:
+                mult_state = "in"
+
+        if stats_state == "pre":
+            # Cheap literal prefilter: the total line is the only one that has
+            # to contain "=", so most lines never reach the regex engine.
+            if "=" in line:
+                m = total_match(line)
+                if m:
+                    stats["total_pairs"] = int(m.group(1))
+                    stats["total_bases"] = int(m.group(2))
+                    stats_state = "in"
+            continue
 
-    for line in lines[total_idx + 1 :]:
-        line = line.rstrip("\n")
-        if _RE_SEPARATOR.match(line):
+        stripped = line.strip()
+        if not stripped:
             continue
-        tokens = line.split()
-        if not tokens:
+        # "-----..." separator rows, then "WW--cis WW-tran ..." header rows.
+        if len(stripped) >= 5 and not stripped.strip("-"):
             continue
-        if any("--" in t for t in tokens):
-            pending_header = tokens
+        if "--" in stripped:
+            pending_header = stripped.split()
             continue
         if pending_header is None:
             continue
-        if all(re.fullmatch(r"-?\d+", t) for t in tokens):
+        if int_row_fullmatch(stripped):
+            tokens = stripped.split()
             if len(tokens) == len(pending_header):
                 for key, val in zip(pending_header, tokens):
                     pair_type_counts[key] = int(val)
@@ -226,38 +306,44 @@ def _extract_stats(lines: list[str]) -> dict[str, Any]:
 
     if pair_type_counts:
         stats["pair_type_counts"] = dict(sorted(pair_type_counts.items()))
-    return stats
+    if bp_state == "pre":
+        return None, multiplet_lines, stats
+    return base_pair_lines, multiplet_lines, stats
+
+
+def extract_core(out_path: Path, *, require_base_pair_block: bool = False) -> dict[str, Any] | None:
+    # Decoding the whole file and splitlines() gives the same lines as the
+    # universal-newline text reader (\r, \r\n and \n all end a line).
+    text = _read_bytes(out_path).decode("utf-8", errors="replace")
+    return extract_core_from_text(text, require_base_pair_block=require_base_pair_block)
 
 
-def extract_core(out_path: Path) -> dict[str, Any]:
-    lines = out_path.read_text(encoding="utf-8", errors="replace").splitlines(keepends=True)
+def extract_core_from_text(text: str, *, require_base_pair_block: bool = False) -> dict[str, Any] | None:
+    # Same as extract_core() for .out content already in memory.
+    return extract_core_from_lines(text.splitlines(), require_base_pair_block=require_base_pair_block)
 
-    base_pair_lines = _extract_block(lines, _RE_BEGIN_BASE_PAIR, _RE_END_BASE_PAIR)
-    base_pairs: list[BasePairRecord] = []
+
+def extract_core_from_lines(
+    lines: Iterable[str], *, require_base_pair_block: bool = False
+) -> dict[str, Any] | None:
+    # `lines` as produced by str.splitlines(), with or without keepends.
+    base_pair_lines, multiplet_lines, stats = _scan_out_lines(lines)
+    if base_pair_lines is None:
+        # No BEGIN_base-pair sentinel at all (e.g. a non-RNAVIEW .out).
+        if require_base_pair_block:
+            return None
+        base_pair_lines = []
+
+    base_pairs: list[_BasePair] = []
     for raw in base_pair_lines:
         if not raw.strip():
             continue
         parsed = _parse_base_pair_line(raw)
         if parsed is None:
-            base_pairs.append(
-                BasePairRecord(
-                    i=-1,
-                    j=-1,
-                    chain_i="",
-                    resseq_i=-1,
-                    base_i="",
-                    base_j="",
-                    resseq_j=-1,
-                    chain_j="",
-                    kind="unknown",
-                    text=_norm_ws(raw),
-                )
-            )
-        else:
-            base_pairs.append(parsed)
+            parsed = _BasePair(-1, -1, "unknown", "", -1, "", "", -1, "", "", "", 0, "", _norm_ws(raw))
+        base_pairs.append(parsed)
 
-    multiplet_lines = _extract_block(lines, _RE_BEGIN_MULTIPLETS, _RE_END_MULTIPLETS)
-    multiplets: list[MultipletRecord] = []
+    multiplets: list[_Multiplet] = []
     for raw in multiplet_lines:
         s = raw.strip()
         if not s:
@@ -272,52 +358,32 @@ def extract_core(out_path: Path) -> dict[str, Any]:
                     continue
                 if part.isdigit():
                     idxs.append(int(part))
-            multiplets.append(MultipletRecord(indices=tuple(idxs), text=_norm_ws(right)))
+            multiplets.append(_Multiplet(tuple(idxs), _norm_ws(right)))
         else:
-            multiplets.append(MultipletRecord(indices=tuple(), text=_norm_ws(s)))
-
-    stats = _extract_stats(lines)
-
-    def bp_sort_key(bp: BasePairRecord) -> tuple[Any, ...]:
-        return (
-            bp.i,
-            bp.j,
-            bp.kind,
-            bp.chain_i,
-            bp.resseq_i,
-            bp.base_i,
-            bp.base_j,
-            bp.resseq_j,
-            bp.chain_j,
-            bp.lw or "",
-            bp.orientation or "",
-            bp.syn,
-            bp.note or "",
-            bp.text or "",
-        )
-
-    core = {
-        "base_pairs": [bp.to_json() for bp in sorted(base_pairs, key=bp_sort_key)],
-        "multiplets": [m.to_json() for m in sorted(multiplets, key=lambda x: (x.indices, x.text))],
+            multiplets.append(_Multiplet((), _norm_ws(s)))
+
+    # No separate "already sorted?" pass: on presorted input timsort finds one
+    # run in N-1 tuple comparisons, which is all such a check would cost anyway.
+    base_pairs.sort()
+    multiplets.sort()
+    # Records stay tuples through parsing and sorting; the public result (and
+    # the frozen JSON built from it) is dict-based, so convert exactly once here.
+    return {
+        "base_pairs": [_bp_to_json(bp) for bp in base_pairs],
+        "multiplets": [{"indices": list(m.indices), "text": m.text} for m in multiplets],
         "stats": stats,
     }
-    return core
-
-
-def _has_base_pair_block(out_path: Path) -> bool:
-    try:
-        for line in out_path.open("r", encoding="utf-8", errors="replace"):
-            if _RE_BEGIN_BASE_PAIR.match(line):
-                return True
-    except OSError:
-        return False
-    return False
 
 
 def _iter_differences(a: Any, b: Any, path: str = "") -> Iterable[str]:
     if a == b:
         return
     if isinstance(a, dict) and isinstance(b, dict):
+        if a.keys() == b.keys():
+            # Common case (same record shape): no set algebra needed.
+            for k in sorted(a):
+                yield from _iter_differences(a[k], b[k], f"{path}/{k}")
+            return
         a_keys = set(a.keys())
         b_keys = set(b.keys())
         for k in sorted(a_keys - b_keys):
@@ -339,18 +405,23 @@ def _iter_differences(a: Any, b: Any, path: str = "") -> Iterable[str]:
 
 def _cmd_extract(args: argparse.Namespace) -> int:
     core = extract_core(Path(args.out))
-    sys.stdout.write(json.dumps(core, sort_keys=True, ensure_ascii=False, separators=(",", ":")))
-    sys.stdout.write("\n")
+    sys.stdout.write(_json_dumps_bytes(core).decode("utf-8"))
     return 0
 
 
-def _cmd_compare(args: argparse.Namespace) -> int:
-    left = extract_core(Path(args.left))
-    right = extract_core(Path(args.right))
+def compare_cores(left: dict[str, Any] | None, right: dict[str, Any] | None) -> list[str]:
+    # Difference lines between two extracted cores (empty when they match),
+    # for callers that already hold both cores.
     if left == right:
+        return []
+    return list(_iter_differences(left, right, path=""))
+
+
+def _cmd_compare(args: argparse.Namespace) -> int:
+    diffs = compare_cores(extract_core(Path(args.left)), extract_core(Path(args.right)))
+    if not diffs:
         return 0
 
-    diffs = list(_iter_differences(left, right, path=""))
     for line in diffs[: args.max_diffs]:
         sys.stderr.write(line + "\n")
     if len(diffs) > args.max_diffs:
@@ -358,6 +429,63 @@ def _cmd_compare(args: argparse.Namespace) -> int:
     return 1
 
 
+def _iter_out_files(root: str, exclude_suffixes: tuple[str, ...]) -> Iterator[str]:
+    # Same selection and order as sorted(Path(root).rglob("*.out")) minus the
+    # excluded suffixes: entries are visited in name order per directory (which
+    # is Path's parts-wise ordering), symlinked directories are not descended
+    # into and unreadable ones are skipped. Yields plain path strings.
+    try:
+        with os.scandir(root) as it:
+            entries = sorted(it, key=attrgetter("name"))
+    except PermissionError:
+        return
+    for entry in entries:
+        name = entry.name
+        if name.endswith(".out") and not any(name.endswith(sfx) for sfx in exclude_suffixes):
+            yield entry.path
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        if is_dir:
+            yield from _iter_out_files(entry.path, exclude_suffixes)
+
+
+def _freeze_one(
+    out_file: str,
+    *,
+    allow_unknown: bool,
+    allow_missing_stats: bool,
+    encode: bool,
+) -> tuple[str, Any] | None:
+    # Runs in a freeze worker: returns None to skip the file, ("error", message),
+    # or ("ok", (core_json_bytes, counts)).
+    try:
+        core = extract_core(Path(out_file), require_base_pair_block=True)
+    except OSError:
+        return None
+    if core is None:
+        return None
+
+    unknown_count = sum(1 for bp in core["base_pairs"] if bp.get("kind") == "unknown")
+    if unknown_count and not allow_unknown:
+        return "error", f"unknown base-pair lines ({unknown_count})"
+
+    stats = core.get("stats", {})
+    required_keys = ("total_pairs", "total_bases", "pair_type_counts")
+    missing = [k for k in required_keys if k not in stats]
+    if missing and not allow_missing_stats:
+        return "error", f"missing stats fields {missing}"
+
+    core_bytes = _json_dumps_bytes(core) if encode else b""
+    counts = {
+        "base_pairs": len(core["base_pairs"]),
+        "multiplets": len(core["multiplets"]),
+        "unknown_base_pairs": unknown_count,
+    }
+    return "ok", (core_bytes, counts)
+
+
 def _cmd_freeze(args: argparse.Namespace) -> int:
     repo_root = Path(__file__).resolve().parents[1]
 
@@ -377,13 +505,7 @@ def _cmd_freeze(args: argparse.Namespace) -> int:
     keep_going = bool(args.keep_going)
     dry_run = bool(args.dry_run)
 
-    candidates: list[Path] = []
-    for out_file in sorted(root.rglob("*.out")):
-        if any(out_file.name.endswith(sfx) for sfx in exclude_suffixes):
-            continue
-        if not _has_base_pair_block(out_file):
-            continue
-        candidates.append(out_file)
+    candidates = list(_iter_out_files(str(root), exclude_suffixes)) if root.is_dir() else []
 
     errors: list[str] = []
     manifest_entries: list[dict[str, Any]] = []
@@ -397,69 +519,71 @@ def _cmd_freeze(args: argparse.Namespace) -> int:
         except ValueError:
             return str(p)
 
-    for out_file in candidates:
-        core = extract_core(out_file)
-
-        unknown_count = sum(1 for bp in core["base_pairs"] if bp.get("kind") == "unknown")
-        if unknown_count and not allow_unknown:
-            errors.append(f"{out_file}: unknown base-pair lines ({unknown_count})")
-            if not keep_going:
-                break
-            continue
-
-        stats = core.get("stats", {})
-        required_keys = ("total_pairs", "total_bases", "pair_type_counts")
-        missing = [k for k in required_keys if k not in stats]
-        if missing and not allow_missing_stats:
-            errors.append(f"{out_file}: missing stats fields {missing}")
-            if not keep_going:
-                break
-            continue
-
-        rel_out = out_file.relative_to(root)
-        rel_core = rel_out.with_suffix(".core.json")
-        core_path = out_dir / rel_core
-
-        if args.verbose:
-            sys.stderr.write(f"{out_file} -> {core_path}\n")
-
-        if not dry_run:
-            core_path.parent.mkdir(parents=True, exist_ok=True)
-            core_path.write_text(
-                json.dumps(core, sort_keys=True, ensure_ascii=False, separators=(",", ":")) + "\n",
-                encoding="utf-8",
-            )
-
-        manifest_entries.append(
-            {
-                "out": _rel(out_file),
-                "core_json": _rel(core_path),
-                "counts": {
-                    "base_pairs": len(core["base_pairs"]),
-                    "multiplets": len(core["multiplets"]),
-                    "unknown_base_pairs": unknown_count,
-                },
-            }
-        )
+    freeze_one = functools.partial(
+        _freeze_one,
+        allow_unknown=allow_unknown,
+        allow_missing_stats=allow_missing_stats,
+        encode=not dry_run,
+    )
+    workers = max(1, min(int(args.workers), len(candidates)))
+    ex = None
+    if workers > 1:
+        import concurrent.futures
+
+        # Processes rather than threads: parsing and JSON encoding are pure Python.
+        # map() keeps candidate order, so the first failure (and the point where we
+        # stop without --keep-going) is the same as in a sequential run.
+        ex = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        results = ex.map(freeze_one, candidates, chunksize=max(1, len(candidates) // (workers * 4)))
+    else:
+        results = map(freeze_one, candidates)
 
-    manifest_entries.sort(key=lambda x: (x["out"], x["core_json"]))
+    try:
+        for out_name, res in zip(candidates, results):
+            if res is None:
+                continue
+            status, payload = res
+            if status == "error":
+                errors.append(f"{out_name}: {payload}")
+                if not keep_going:
+                    break
+                continue
+            core_bytes, counts = payload
+
+            out_file = Path(out_name)
+            rel_out = out_file.relative_to(root)
+            rel_core = rel_out.with_suffix(".core.json")
+            core_path = out_dir / rel_core
+
+            if args.verbose:
+                sys.stderr.write(f"{out_file} -> {core_path}\n")
+
+            if not dry_run:
+                core_path.parent.mkdir(parents=True, exist_ok=True)
+                _write_bytes(core_path, core_bytes)
+
+            manifest_entries.append({"out": _rel(out_file), "core_json": _rel(core_path), "counts": counts})
+    finally:
+        if ex is not None:
+            ex.shutdown(cancel_futures=True)
+
+    # Entries already arrive in walk order, which is almost always the final
+    # string order too; timsort then only confirms the single run.
+    manifest_entries.sort(key=itemgetter("out", "core_json"))
 
     if not dry_run:
         manifest_path = out_dir / "manifest.json"
-        manifest_path.write_text(
-            json.dumps(
+        _write_bytes(
+            manifest_path,
+            _json_dumps_bytes(
                 {
                     "schema_version": 1,
                     "root": _rel(root),
                     "exclude_suffix": list(exclude_suffixes),
                     "entries": manifest_entries,
                 },
-                sort_keys=True,
-                ensure_ascii=False,
                 indent=2,
-            )
-            + "\n",
-            encoding="utf-8",
+            ),
         )
 
     if errors:
@@ -523,6 +647,12 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Continue even if some files fail validation (still exits non-zero)",
     )
+    p_freeze.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel extraction processes (default: CPU count; 1 = in-process)",
+    )
     p_freeze.add_argument("--dry-run", action="store_true", help="List files but do not write output")
     p_freeze.add_argument("--verbose", action="store_true", help="Print per-file mapping to stderr")
     p_freeze.set_defaults(func=_cmd_freeze)
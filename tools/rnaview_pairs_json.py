@@ -2,26 +2,33 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import importlib.util
-import json
+import os
 import sys
-import tempfile
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator, TextIO
 
 
+@functools.lru_cache(maxsize=None)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+_RNAVIEW_OUT_CORE: Any = None
+
+
 def _load_rnaview_out_core():
-    mod_path = _repo_root() / "tools" / "rnaview_out_core.py"
-    spec = importlib.util.spec_from_file_location("rnaview_out_core", mod_path)
-    assert spec and spec.loader
-    mod = importlib.util.module_from_spec(spec)
-    sys.modules[spec.name] = mod
-    spec.loader.exec_module(mod)
-    return mod
+    global _RNAVIEW_OUT_CORE
+    if _RNAVIEW_OUT_CORE is None:
+        mod_path = _repo_root() / "tools" / "rnaview_out_core.py"
+        spec = importlib.util.spec_from_file_location("rnaview_out_core", mod_path)
+        assert spec and spec.loader
+        mod = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = mod
+        spec.loader.exec_module(mod)
+        _RNAVIEW_OUT_CORE = mod
+    return _RNAVIEW_OUT_CORE
 
 
 def pairs_json_from_core(
@@ -32,6 +39,8 @@ def pairs_json_from_core(
     options: dict[str, Any] | None = None,
     schema_version: int = 1,
 ) -> dict[str, Any]:
+    # `core` and `options` are referenced, not copied or re-validated, so
+    # wrapping an already-loaded golden core costs nothing per record.
     out: dict[str, Any] = {"schema_version": int(schema_version), "core": core}
     if source_path is not None or source_format is not None:
         out["source"] = {}
@@ -87,28 +96,28 @@ def _format_base_pair_line(bp: dict[str, Any]) -> str:
     if syn_count < 0:
         syn_count = 0
 
-    tokens: list[str] = []
     if kind == "stacked":
-        tokens.extend(["syn"] * syn_count)
-        tokens.append("stacked")
+        rest = "syn " * syn_count + "stacked"
     else:
         lw = bp.get("lw")
         if not lw:
             raise ValueError(f"base-pair record missing lw: {bp}")
-        tokens.append(str(lw))
+        tokens = [str(lw)]
         orientation = bp.get("orientation")
         if orientation:
             tokens.append(str(orientation))
-        tokens.extend(["syn"] * syn_count)
+        if syn_count:
+            tokens.extend(["syn"] * syn_count)
         note = bp.get("note")
         if note:
             tokens.append(str(note))
+        rest = " ".join(tokens).strip()
 
-    rest = " ".join(tokens).strip()
+    # A single f-string is cheaper here than concatenating/joining the parts.
     return f"{i}_{j}, {chain_i}: {resseq_i} {base_i}-{base_j} {resseq_j} {chain_j}: {rest}".rstrip()
 
 
-def out_core_from_pairs_json(pairs: dict[str, Any]) -> str:
+def _iter_out_core_lines(pairs: dict[str, Any]) -> Iterator[str]:
     core = pairs.get("core", pairs)
     base_pairs = list(core.get("base_pairs", []))
     multiplets = list(core.get("multiplets", []))
@@ -117,84 +126,106 @@ def out_core_from_pairs_json(pairs: dict[str, Any]) -> str:
     base_pairs.sort(key=_bp_sort_key)
     multiplets.sort(key=lambda m: (m.get("indices", []), m.get("text", "")))
 
-    lines: list[str] = []
-    lines.append("BEGIN_base-pair")
-    for bp in base_pairs:
-        s = _format_base_pair_line(bp)
-        if s:
-            lines.append(s)
-    lines.append("END_base-pair")
-    lines.append("")
-    lines.append("Summary of triplets and higher multiplets")
-    lines.append("BEGIN_multiplets")
+    yield "BEGIN_base-pair"
+    # filter(None, ...) drops empty renderings (blank "unknown" records).
+    yield from filter(None, map(_format_base_pair_line, base_pairs))
+    yield from ("END_base-pair", "", "Summary of triplets and higher multiplets", "BEGIN_multiplets")
     for m in multiplets:
-        indices = list(m.get("indices", []))
+        indices = m.get("indices", [])
         text = str(m.get("text", "")).strip()
         if indices:
-            idx_part = "_".join(str(int(x)) for x in indices)
-            lines.append(f"{idx_part}_| {text}".rstrip())
-        else:
-            if text:
-                lines.append(text)
-    lines.append("END_multiplets")
-    lines.append("")
+            idx_part = "_".join([str(int(x)) for x in indices])
+            yield f"{idx_part}_| {text}".rstrip()
+        elif text:
+            yield text
+    yield from ("END_multiplets", "")
 
     total_pairs = stats.get("total_pairs")
     total_bases = stats.get("total_bases")
     if total_pairs is not None and total_bases is not None:
-        lines.append(f"  The total base pairs = {int(total_pairs):3d} (from {int(total_bases):4d} bases)")
+        yield f"  The total base pairs = {int(total_pairs):3d} (from {int(total_bases):4d} bases)"
         pair_type_counts = stats.get("pair_type_counts") or {}
         if pair_type_counts:
             keys = list(pair_type_counts.keys())
-            lines.append("------------------------------------------------")
-            lines.append(" ".join(str(k) for k in keys))
-            lines.append(" ".join(str(int(pair_type_counts[k])) for k in keys))
-            lines.append("------------------------------------------------")
+            yield "------------------------------------------------"
+            yield " ".join(str(k) for k in keys)
+            yield " ".join(str(int(pair_type_counts[k])) for k in keys)
+            yield "------------------------------------------------"
 
-    return "\n".join(lines) + "\n"
 
-
-def _json_dumps(obj: Any) -> str:
-    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")) + "\n"
+def out_core_from_pairs_json(pairs: dict[str, Any]) -> str:
+    return "\n".join(_iter_out_core_lines(pairs)) + "\n"
+
+
+def out_core_stream_to(pairs: dict[str, Any], fp: TextIO, *, chunk_size: int = 64 * 1024) -> None:
+    # Same text as out_core_from_pairs_json(), written to `fp` in ~chunk_size
+    # pieces so the whole .out(core) is never held as one string.
+    buf: list[str] = []
+    size = 0
+    for line in _iter_out_core_lines(pairs):
+        buf.append(line)
+        size += len(line) + 1
+        if size >= chunk_size:
+            buf.append("")
+            fp.write("\n".join(buf))
+            buf.clear()
+            size = 0
+    if buf:
+        buf.append("")
+        fp.write("\n".join(buf))
 
 
 def _cmd_from_out(args: argparse.Namespace) -> int:
     pairs = pairs_json_from_out(Path(args.out))
-    text = _json_dumps(pairs)
+    data = _load_rnaview_out_core()._json_dumps_bytes(pairs)
     if args.output:
-        Path(args.output).write_text(text, encoding="utf-8")
+        Path(args.output).write_bytes(data)
     else:
-        sys.stdout.write(text)
+        sys.stdout.write(data.decode("utf-8"))
     return 0
 
 
+def _stream_out_core_file(pairs: dict[str, Any], out_path: Path) -> None:
+    # Stream into a sibling temp file and rename it over the target, so a record
+    # that fails to render never leaves a truncated .out behind.
+    tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0), 0o666)
+    try:
+        with open(fd, "w", encoding="utf-8") as fh:
+            out_core_stream_to(pairs, fh)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def _cmd_write_out(args: argparse.Namespace) -> int:
-    pairs = json.loads(Path(args.pairs).read_text(encoding="utf-8"))
-    out_text = out_core_from_pairs_json(pairs)
+    pairs = _load_rnaview_out_core()._json_loads_bytes(Path(args.pairs).read_bytes())
     if args.output:
-        Path(args.output).write_text(out_text, encoding="utf-8")
+        _stream_out_core_file(pairs, Path(args.output))
     else:
-        sys.stdout.write(out_text)
+        # stdout cannot be rolled back, so render fully before writing anything.
+        sys.stdout.write(out_core_from_pairs_json(pairs))
     return 0
 
 
-def _iter_differences(a: Any, b: Any) -> Iterable[str]:
-    mod = _load_rnaview_out_core()
+def _iter_differences(a: Any, b: Any, mod: Any = None) -> Iterable[str]:
+    if mod is None:
+        mod = _load_rnaview_out_core()
     yield from mod._iter_differences(a, b, path="")
 
 
 def _cmd_validate_golden(args: argparse.Namespace) -> int:
     repo = _repo_root()
     manifest_path = Path(args.manifest) if args.manifest else repo / "test" / "golden_core" / "manifest.json"
-    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
-
     mod = _load_rnaview_out_core()
+    manifest = mod._json_loads_bytes(manifest_path.read_bytes())
 
     failed: list[tuple[str, list[str]]] = []
     for entry in manifest.get("entries", []):
         out_path = repo / entry["out"]
         core_json_path = repo / entry["core_json"]
-        golden_core = json.loads(core_json_path.read_text(encoding="utf-8"))
+        golden_core = mod._json_loads_bytes(core_json_path.read_bytes())
 
         pairs = pairs_json_from_core(
             golden_core,
@@ -204,13 +235,10 @@ def _cmd_validate_golden(args: argparse.Namespace) -> int:
         )
         out_text = out_core_from_pairs_json(pairs)
 
-        with tempfile.NamedTemporaryFile("w", suffix=".out", encoding="utf-8", delete=True) as tmp:
-            tmp.write(out_text)
-            tmp.flush()
-            candidate_core = mod.extract_core(Path(tmp.name))
+        candidate_core = mod.extract_core_from_text(out_text)
 
         if candidate_core != golden_core:
-            diffs = list(_iter_differences(golden_core, candidate_core))
+            diffs = list(_iter_differences(golden_core, candidate_core, mod))
             failed.append((entry["out"], diffs[: args.max_diffs]))
             if not args.keep_going:
                 break
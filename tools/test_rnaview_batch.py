@@ -1,11 +1,20 @@
+import contextlib
+import functools
+import hashlib
 import importlib.util
+import io
 import json
+import os
+import shutil
 import sys
 import tempfile
 import unittest
+from operator import itemgetter
 from pathlib import Path
+from unittest import mock
 
 
+@functools.lru_cache(maxsize=None)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
@@ -19,6 +28,12 @@ def _load_module(name: str, path: Path):
     return mod
 
 
+def _read_run_outputs(out_dir: Path) -> tuple[dict, list[dict]]:
+    summary = json.loads((out_dir / "summary.json").read_text(encoding="utf-8"))
+    lines = (out_dir / "results.ndjson").read_text(encoding="utf-8").splitlines()
+    return summary, [json.loads(line) for line in lines]
+
+
 class TestBatchRunner(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -54,3 +69,186 @@ class TestBatchRunner(unittest.TestCase):
             job_dir = Path(res["job_dir"])
             self.assertTrue((job_dir / "pairs.json").exists())
             self.assertTrue((job_dir / "legacy.out").exists())
+
+    def test_dedupe_identical_rejects_regress(self) -> None:
+        inp = self.repo / "test" / "pdb" / "tr0001" / "tr0001.pdb"
+        with tempfile.TemporaryDirectory() as td:
+            stderr = io.StringIO()
+            with contextlib.redirect_stderr(stderr):
+                code = self.batch_mod.main(
+                    ["run", str(inp), "--out-dir", td, "--workers", "1", "--dedupe-identical", "--regress"]
+                )
+            self.assertEqual(code, 2)
+            self.assertIn("--dedupe-identical", stderr.getvalue())
+            self.assertFalse((Path(td) / "summary.json").exists())
+
+    def test_unprivileged_negative_nice_exits_two(self) -> None:
+        if not hasattr(os, "setpriority"):
+            self.skipTest("no setpriority on this platform")
+        inp = self.repo / "test" / "pdb" / "tr0001" / "tr0001.pdb"
+        with tempfile.TemporaryDirectory() as td:
+            stderr = io.StringIO()
+            # Simulate a non-root user: lowering niceness is refused.
+            with mock.patch.object(os, "setpriority", side_effect=PermissionError), contextlib.redirect_stderr(stderr):
+                code = self.batch_mod.main(["run", str(inp), "--out-dir", td, "--workers", "1", "--nice=-5"])
+            self.assertEqual(code, 2)
+            self.assertIn("--nice -5", stderr.getvalue())
+
+    def test_summary_matches_results_ndjson(self) -> None:
+        if not (self.repo / "bin" / "rnaview").exists():
+            self.skipTest("missing legacy binary: bin/rnaview")
+
+        src = self.repo / "test" / "pdb" / "tr0001" / "tr0001.pdb"
+        with tempfile.TemporaryDirectory() as td:
+            in_dir = Path(td) / "in"
+            in_dir.mkdir()
+            for name in ("a.pdb", "b.pdb"):
+                shutil.copyfile(src, in_dir / name)
+            out_dir = Path(td) / "out"
+            code = self.batch_mod.main(["run", str(in_dir), "--out-dir", str(out_dir), "--workers", "2"])
+            self.assertEqual(code, 0)
+            summary, records = _read_run_outputs(out_dir)
+            summary_text = (out_dir / "summary.json").read_text(encoding="utf-8")
+
+        # Outside "results" the file keeps the json.dumps(indent=2) layout.
+        expected = json.dumps({**summary, "results": []}, indent=2, sort_keys=True) + "\n"
+        head, tail = expected.split('"results": []')
+        self.assertTrue(summary_text.startswith(head + '"results": [\n'), msg=summary_text[:200])
+        self.assertTrue(summary_text.endswith("\n  ]" + tail), msg=summary_text[-200:])
+
+        self.assertEqual(summary["schema_version"], 1)
+        self.assertEqual(summary["counts"], {"ok": 2, "skipped": 0, "failed": 0, "regress_failed": 0})
+        # summary.json lists the same records as results.ndjson, sorted.
+        self.assertEqual(summary["results"], sorted(records, key=itemgetter("status", "job_id", "input")))
+        for r in records:
+            self.assertEqual(
+                set(r),
+                {
+                    "input",
+                    "job_id",
+                    "engine",
+                    "status",
+                    "job_dir",
+                    "pairs_json",
+                    "legacy_out",
+                    "error",
+                    "regress_ok",
+                    "regress_diffs",
+                    "elapsed_ms",
+                },
+            )
+
+    def test_split_identical_inputs(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            (d / "a.pdb").write_bytes(b"ATOM 1\n")
+            (d / "b.pdb").write_bytes(b"ATOM 1\n")  # identical to a
+            (d / "c.pdb").write_bytes(b"ATOM 2\n")  # same size as a, other bytes
+            (d / "d.pdb").write_bytes(b"HETATM\n\n")  # unique size
+            missing = d / "missing.pdb"
+            inputs = [d / "a.pdb", d / "b.pdb", d / "c.pdb", d / "d.pdb", missing]
+
+            unique, duplicates = self.batch_mod._split_identical_inputs(inputs)
+
+        # Unreadable paths are kept so the job itself reports the failure.
+        self.assertEqual(unique, [d / "a.pdb", d / "c.pdb", d / "d.pdb", missing])
+        self.assertEqual(duplicates, {d / "b.pdb": d / "a.pdb"})
+
+    def test_job_id_hash_algo(self) -> None:
+        path = Path("/data/tr0001.pdb")
+        sha1 = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:8]
+        blake = hashlib.blake2b(str(path).encode("utf-8"), digest_size=4).hexdigest()
+        self.assertEqual(self.batch_mod._job_id_for_input(path, "stem-hash"), f"tr0001__{sha1}")
+        self.assertEqual(self.batch_mod._job_id_for_input(path, "stem-hash", "blake2b"), f"tr0001__{blake}")
+        self.assertEqual(self.batch_mod._job_id_for_input(path, "name-hash", "blake2b"), f"tr0001.pdb__{blake}")
+
+    def test_maybe_copy_falls_back_when_link_and_reflink_fail(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "src.pdb"
+            src.write_bytes(b"ATOM      1  P     G A   1\n")
+            dst = Path(td) / "job" / "src.pdb"
+            with mock.patch.object(os, "link", side_effect=OSError), mock.patch.object(
+                self.batch_mod, "_reflink", wraps=self.batch_mod._reflink
+            ) as reflink:
+                self.batch_mod._maybe_copy(src, dst)
+            reflink.assert_called_once_with(src, dst)
+            self.assertEqual(dst.read_bytes(), src.read_bytes())
+            self.assertNotEqual(os.stat(dst).st_ino, os.stat(src).st_ino)
+
+    def test_reflink_failure_leaves_no_partial_destination(self) -> None:
+        if not sys.platform.startswith("linux"):
+            self.skipTest("reflink is only attempted on Linux")
+        import fcntl
+
+        with tempfile.TemporaryDirectory() as td:
+            src = Path(td) / "src.pdb"
+            src.write_bytes(b"ATOM\n")
+            dst = Path(td) / "dst.pdb"
+            with mock.patch.object(fcntl, "ioctl", side_effect=OSError):
+                self.assertFalse(self.batch_mod._reflink(src, dst))
+            self.assertFalse(dst.exists())
+
+    def test_first_out_file(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            d = Path(td)
+            for name in ("legacy.out", "b.out", "c.pdb"):
+                (d / name).write_text("x", encoding="utf-8")
+            (d / "a.out").mkdir()  # directories named *.out are ignored
+            self.assertEqual(self.batch_mod._first_out_file(d, skip="legacy.out"), d / "b.out")
+            (d / "b.out").unlink()
+            self.assertIsNone(self.batch_mod._first_out_file(d, skip="legacy.out"))
+
+    def test_dedupe_identical_reports_duplicates(self) -> None:
+        if not (self.repo / "bin" / "rnaview").exists():
+            self.skipTest("missing legacy binary: bin/rnaview")
+
+        src = self.repo / "test" / "pdb" / "tr0001" / "tr0001.pdb"
+        with tempfile.TemporaryDirectory() as td:
+            in_dir = Path(td) / "in"
+            in_dir.mkdir()
+            for name in ("a.pdb", "b.pdb"):
+                shutil.copyfile(src, in_dir / name)
+            out_dir = Path(td) / "out"
+            argv = ["run", str(in_dir), "--out-dir", str(out_dir), "--workers", "2"]
+            argv += ["--dedupe-identical", "--hash-algo", "blake2b", "--nice", "1"]
+            if hasattr(os, "sched_setaffinity"):
+                argv.append("--pin-workers")
+            code = self.batch_mod.main(argv)
+            self.assertEqual(code, 0)
+            summary, records = _read_run_outputs(out_dir)
+
+        # The duplicate repeats its canonical job's outcome and outputs.
+        self.assertEqual(summary["counts"], {"ok": 2, "skipped": 0, "failed": 0, "regress_failed": 0})
+        by_name = {Path(r["input"]).name: r for r in records}
+        first, dup = by_name["a.pdb"], by_name["b.pdb"]
+        self.assertNotIn("duplicate_of", first)
+        self.assertEqual(dup["status"], "ok")
+        self.assertEqual(dup["duplicate_of"], first["input"])
+        self.assertEqual(dup["job_dir"], first["job_dir"])
+        self.assertEqual(dup["pairs_json"], first["pairs_json"])
+        blake = hashlib.blake2b(dup["input"].encode("utf-8"), digest_size=4).hexdigest()
+        self.assertEqual(dup["job_id"], f"b__{blake}")
+
+    def test_dedupe_identical_duplicate_of_failed_input_fails(self) -> None:
+        if not (self.repo / "bin" / "rnaview").exists():
+            self.skipTest("missing legacy binary: bin/rnaview")
+
+        with tempfile.TemporaryDirectory() as td:
+            in_dir = Path(td) / "in"
+            in_dir.mkdir()
+            for name in ("a.pdb", "b.pdb", "c.pdb"):
+                (in_dir / name).write_text("not a structure\n", encoding="utf-8")
+            out_dir = Path(td) / "out"
+            code = self.batch_mod.main(
+                ["run", str(in_dir), "--out-dir", str(out_dir), "--workers", "1", "--dedupe-identical"]
+            )
+            summary, records = _read_run_outputs(out_dir)
+
+        self.assertEqual(code, 1)
+        self.assertEqual(summary["counts"], {"ok": 0, "skipped": 0, "failed": 3, "regress_failed": 0})
+        by_name = {Path(r["input"]).name: r for r in records}
+        for name in ("b.pdb", "c.pdb"):
+            with self.subTest(input=name):
+                self.assertEqual(by_name[name]["status"], "failed")
+                self.assertEqual(by_name[name]["duplicate_of"], by_name["a.pdb"]["input"])
+                self.assertEqual(by_name[name]["error"], by_name["a.pdb"]["error"])
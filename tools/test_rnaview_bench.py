@@ -0,0 +1,207 @@
+import contextlib
+import functools
+import importlib.util
+import io
+import json
+import os
+import random
+import statistics
+import stat
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+@functools.lru_cache(maxsize=None)
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _load_module(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _sample_sets() -> list[list[int]]:
+    rng = random.Random(1234)
+    sets = [[7], [5, 3], [4, 1, 9], [2, 2, 2, 2]]
+    # Both sides of the 32-sample numpy threshold, odd and even lengths.
+    for n in (31, 32, 33, 100, 257):
+        sets.append([rng.randrange(0, 50_000) for _ in range(n)])
+    return sets
+
+
+# Stand-in engine: logs start/end times per input, then writes <input>.out.
+_FAKE_ENGINE = """#!/bin/sh
+for a; do input="$a"; done
+echo "$(basename "$0") $input start $(date +%s.%N)" >> "$BENCH_TEST_LOG"
+sleep 0.2
+cp "$input" "$input.out"
+echo "$(basename "$0") $input end $(date +%s.%N)" >> "$BENCH_TEST_LOG"
+"""
+
+
+# Fails if an earlier run's side output is still in the staging dir.
+_LITTERING_ENGINE = """#!/bin/sh
+for a; do input="$a"; done
+if [ -e side.txt ] || [ -e "$input.out" ]; then exit 3; fi
+echo run > side.txt
+cp "$input" "$input.out"
+"""
+
+
+def _write_fake_engine(path: Path, script: str = _FAKE_ENGINE) -> Path:
+    path.write_text(script, encoding="utf-8")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return path
+
+
+def _engine_intervals(log_path: Path) -> dict[tuple[str, str], tuple[float, float]]:
+    # (engine, input) -> (start, end); one measured run per engine and case.
+    starts: dict[tuple[str, str], float] = {}
+    out: dict[tuple[str, str], tuple[float, float]] = {}
+    for line in log_path.read_text(encoding="utf-8").splitlines():
+        engine, input_arg, event, t = line.split()
+        key = (engine, input_arg)
+        if event == "start":
+            starts[key] = float(t)
+        else:
+            out[key] = (starts[key], float(t))
+    return out
+
+
+class TestSummarizeInts(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.mod = _load_module("rnaview_bench", _repo_root() / "tools" / "rnaview_bench.py")
+
+    def _pure(self, values: list[int]) -> dict:
+        with mock.patch.object(self.mod, "_optional_numpy", return_value=None):
+            return self.mod._summarize_ints(values)
+
+    def test_pure_python_matches_statistics(self) -> None:
+        self.assertEqual(self._pure([]), {})
+        for values in _sample_sets():
+            with self.subTest(n=len(values)):
+                out = self._pure(values)
+                self.assertEqual(out["n"], len(values))
+                self.assertEqual(out["min_ms"], min(values))
+                self.assertEqual(out["max_ms"], max(values))
+                self.assertEqual(out["median_ms"], int(statistics.median(values)))
+                self.assertEqual(out["mean_ms"], int(statistics.mean(values)))
+                if len(values) >= 2:
+                    self.assertEqual(out["stdev_ms"], statistics.stdev(values))
+                else:
+                    self.assertNotIn("stdev_ms", out)
+
+    def test_numpy_path_matches_pure_python(self) -> None:
+        if self.mod._optional_numpy() is None:
+            self.skipTest("numpy is not installed")
+        for values in _sample_sets():
+            with self.subTest(n=len(values)):
+                self.assertEqual(self.mod._summarize_ints(values), self._pure(values))
+
+
+class TestCompareScheduling(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.mod = _load_module("rnaview_bench", _repo_root() / "tools" / "rnaview_bench.py")
+
+    def _compare(self, td: Path, *extra: str) -> tuple[int, dict, dict]:
+        legacy = _write_fake_engine(td / "legacy")
+        rustcore = _write_fake_engine(td / "rustcore")
+        inputs = []
+        for name in ("a.pdb", "b.pdb"):
+            (td / name).write_text(f"ATOM {name}\n", encoding="utf-8")
+            inputs.append(str(td / name))
+        log_path = td / "engine.log"
+        json_path = td / "bench.json"
+        argv = ["compare", *inputs, "--legacy-bin", str(legacy), "--rustcore-bin", str(rustcore)]
+        argv += ["--warmup", "0", "--runs", "1", "--verify", "none", "--no-prewarm", "-o", str(json_path), *extra]
+        with mock.patch.dict(os.environ, {"BENCH_TEST_LOG": str(log_path)}), contextlib.redirect_stderr(io.StringIO()):
+            code = self.mod.main(argv)
+        return code, json.loads(json_path.read_text(encoding="utf-8")), _engine_intervals(log_path)
+
+    def test_engines_of_a_case_run_back_to_back_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            code, report, intervals = self._compare(Path(td), "--jobs", "2")
+        self.assertEqual(code, 0)
+        self.assertFalse(report["config"]["parallel_engines"])
+        self.assertEqual(len(report["cases"]), 2)
+        for name in ("a.pdb", "b.pdb"):
+            with self.subTest(input=name):
+                # Legacy runs first, and rustcore starts only after it finished.
+                self.assertLessEqual(intervals[("legacy", name)][1], intervals[("rustcore", name)][0])
+
+    def test_parallel_engines_still_reports_every_case(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            code, report, intervals = self._compare(Path(td), "--jobs", "2", "--parallel-engines")
+        self.assertEqual(code, 0)
+        self.assertTrue(report["config"]["parallel_engines"])
+        self.assertEqual([Path(c["input"]).name for c in report["cases"]], ["a.pdb", "b.pdb"])
+        self.assertEqual(len(intervals), 4)
+
+    def test_pin_cpu_rejects_concurrent_runs(self) -> None:
+        if not hasattr(os, "sched_setaffinity"):
+            self.skipTest("no sched_setaffinity on this platform")
+        cpu = min(os.sched_getaffinity(0))
+        for extra in (["--jobs", "2"], ["--jobs", "1", "--parallel-engines"]):
+            with self.subTest(extra=extra), tempfile.TemporaryDirectory() as td:
+                (Path(td) / "a.pdb").write_text("ATOM\n", encoding="utf-8")
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    code = self.mod.main(
+                        ["compare", td, "--legacy-bin", sys.executable, "--rustcore-bin", sys.executable]
+                        + ["--pin-cpu", str(cpu), *extra]
+                    )
+                self.assertEqual(code, 2)
+                self.assertIn("--pin-cpu requires --jobs 1", stderr.getvalue())
+
+    def test_pin_cpu_with_one_job(self) -> None:
+        if not hasattr(os, "sched_setaffinity"):
+            self.skipTest("no sched_setaffinity on this platform")
+        saved = os.sched_getaffinity(0)
+        cpu = min(saved)
+        try:
+            with tempfile.TemporaryDirectory() as td:
+                code, report, _ = self._compare(Path(td), "--jobs", "1", "--pin-cpu", str(cpu))
+        finally:
+            os.sched_setaffinity(0, saved)
+        self.assertEqual(code, 0)
+        self.assertEqual(report["config"]["pin_cpu"], cpu)
+
+    def test_thread_env_defaults_shared_by_compare_and_profile(self) -> None:
+        with mock.patch.dict(os.environ, {"OPENBLAS_NUM_THREADS": "4"}):
+            os.environ.pop("OMP_NUM_THREADS", None)
+            env = self.mod._bench_base_env()
+        self.assertEqual(env["OMP_NUM_THREADS"], "1")
+        self.assertEqual(env["OPENBLAS_NUM_THREADS"], "4")
+
+    def test_each_run_starts_from_a_clean_staging_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            engine = _write_fake_engine(Path(td) / "legacy", _LITTERING_ENGINE)
+            input_abs = Path(td) / "a.pdb"
+            input_abs.write_text("ATOM\n", encoding="utf-8")
+            samples, _digest, size = self.mod._run_engine_case(
+                engine_name="legacy",
+                engine_bin=engine,
+                input_abs=input_abs,
+                input_arg=Path("case") / "a.pdb",
+                flags=(),
+                base_env=self.mod._bench_base_env(),
+                sysroot={},
+                warmup=1,
+                runs=2,
+                timeout_s=None,
+                log_dir=None,
+                verify_out=Path(td) / "verify.out",
+            )
+            self.assertEqual(Path(td, "verify.out").read_text(encoding="utf-8"), "ATOM\n")
+        self.assertEqual([sample.returncode for sample in samples], [0, 0])
+        self.assertEqual(size, len("ATOM\n"))
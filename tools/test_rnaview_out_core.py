@@ -1,15 +1,21 @@
 import contextlib
+import functools
 import importlib.util
 import io
+import mmap
+import os
 import sys
 import unittest
 from pathlib import Path
+from typing import Iterator
 
 
+@functools.lru_cache(maxsize=None)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+@functools.lru_cache(maxsize=None)
 def _load_rnaview_out_core():
     root = _repo_root()
     mod_path = root / "tools" / "rnaview_out_core.py"
@@ -21,30 +27,74 @@ def _load_rnaview_out_core():
     return mod
 
 
+def _scan_out(root: str) -> Iterator[os.DirEntry]:
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_out(entry.path)
+            elif entry.name.endswith(".out"):
+                yield entry
+
+
+def _has_begin_base_pair(data: bytes | mmap.mmap) -> bool:
+    # A line that is exactly BEGIN_base-pair (surrounding whitespace allowed),
+    # found with find() instead of decoding and iterating every line. Only the
+    # line around a hit is sliced and stripped, never every line of the file.
+    pos = data.find(b"BEGIN_base-pair")
+    while pos != -1:
+        line_start = data.rfind(b"\n", 0, pos) + 1
+        line_end = data.find(b"\n", pos)
+        if line_end == -1:
+            line_end = len(data)
+        if data[line_start:line_end].strip() == b"BEGIN_base-pair":
+            return True
+        pos = data.find(b"BEGIN_base-pair", pos + 1)
+    return False
+
+
+def _file_has_begin_base_pair(path: str) -> bool:
+    # Scan a read-only mapping so only the pages up to the sentinel are faulted
+    # in, rather than reading the whole file first.
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return False
+        with mmap.mmap(fh.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            return _has_begin_base_pair(mm)
+
+
 class TestRnaViewOutCore(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
         cls.root = _repo_root()
         cls.mod = _load_rnaview_out_core()
+        # Parsed once and shared by the tr0001 tests below.
+        cls.tr0001_out = cls.root / "test" / "pdb" / "tr0001" / "tr0001.pdb.out"
+        cls.tr0001_core = cls.mod.extract_core(cls.tr0001_out)
 
     def test_extract_core_tr0001(self) -> None:
-        out_path = self.root / "test" / "pdb" / "tr0001" / "tr0001.pdb.out"
-        core = self.mod.extract_core(out_path)
+        core = self.tr0001_core
 
         self.assertEqual(core["stats"]["total_pairs"], 30)
         self.assertEqual(core["stats"]["total_bases"], 76)
         self.assertIn("pair_type_counts", core["stats"])
         self.assertGreater(len(core["stats"]["pair_type_counts"]), 0)
 
+        # Records are flat dicts of str/int, so a set of their item sets gives
+        # O(1) membership checks instead of scanning the list per assertion.
+        bp_index = frozenset(frozenset(bp.items()) for bp in core["base_pairs"])
+
         # A canonical stacked record should parse.
         self.assertIn(
-            {"i": 30, "j": 31, "chain_i": "A", "resseq_i": 30, "base_i": "G", "base_j": "A", "resseq_j": 31, "chain_j": "A", "kind": "stacked"},
-            core["base_pairs"],
+            frozenset(
+                {"i": 30, "j": 31, "chain_i": "A", "resseq_i": 30, "base_i": "G", "base_j": "A", "resseq_j": 31, "chain_j": "A", "kind": "stacked"}.items()
+            ),
+            bp_index,
         )
 
         # A syn + tran record should parse (lw/orientation/syn/note).
         self.assertIn(
-            {
+            frozenset({
                 "i": 9,
                 "j": 23,
                 "chain_i": "A",
@@ -58,8 +108,8 @@ class TestRnaViewOutCore(unittest.TestCase):
                 "orientation": "tran",
                 "syn": 1,
                 "note": "II",
-            },
-            core["base_pairs"],
+            }.items()),
+            bp_index,
         )
 
         # Multiplets should preserve indices.
@@ -68,37 +118,46 @@ class TestRnaViewOutCore(unittest.TestCase):
             [[9, 12, 23], [13, 22, 46]],
         )
 
-    def test_compare_same_file_exit_zero(self) -> None:
-        out_path = self.root / "test" / "pdb" / "tr0001" / "tr0001.pdb.out"
-        code = self.mod.main(["compare", str(out_path), str(out_path)])
+    def test_compare_same_file_no_differences(self) -> None:
+        self.assertEqual(self.mod.compare_cores(self.tr0001_core, self.tr0001_core), [])
+
+    def test_compare_different_files_reports_differences(self) -> None:
+        right = self.mod.extract_core(self.root / "test" / "pdb" / "tr0001" / "tr0001.pdb_sort.out")
+        diffs = self.mod.compare_cores(self.tr0001_core, right)
+        self.assertTrue(diffs)
+        self.assertIn("/base_pairs", "\n".join(diffs[:3]))
+
+    def test_compare_cli_same_file_exit_zero(self) -> None:
+        out_path = str(self.tr0001_out)
+        code = self.mod.main(["compare", out_path, out_path])
         self.assertEqual(code, 0)
 
-    def test_compare_different_files_exit_one(self) -> None:
-        left = self.root / "test" / "pdb" / "tr0001" / "tr0001.pdb.out"
+    def test_compare_cli_different_files_exit_one(self) -> None:
         right = self.root / "test" / "pdb" / "tr0001" / "tr0001.pdb_sort.out"
         stderr = io.StringIO()
         with contextlib.redirect_stderr(stderr):
-            code = self.mod.main(["compare", str(left), str(right), "--max-diffs", "3"])
+            code = self.mod.main(["compare", str(self.tr0001_out), str(right), "--max-diffs", "3"])
         self.assertEqual(code, 1)
         self.assertIn("/base_pairs", stderr.getvalue())
+        self.assertIn("more", stderr.getvalue().splitlines()[-1])
 
     def test_extract_known_outputs_no_unknown_base_pairs(self) -> None:
         candidates: list[Path] = []
-        for out_file in (self.root / "test").rglob("*.out"):
-            name = out_file.name
-            if name.endswith(("_patt.out", "_sort.out", ".out.out")):
+        for entry in _scan_out(str(self.root / "test")):
+            if entry.name.endswith(("_patt.out", "_sort.out", ".out.out")):
+                continue
+            if not _file_has_begin_base_pair(entry.path):
                 continue
-            with out_file.open("r", encoding="utf-8", errors="replace") as handle:
-                if not any(line.strip() == "BEGIN_base-pair" for line in handle):
-                    continue
-            candidates.append(out_file)
+            candidates.append(Path(entry.path))
 
         self.assertGreater(len(candidates), 0)
 
+        # One subTest per file, so every failing file is reported in one run.
         for out_path in candidates:
-            core = self.mod.extract_core(out_path)
-            unknown = sum(1 for bp in core["base_pairs"] if bp.get("kind") == "unknown")
-            self.assertEqual(unknown, 0, msg=f"unexpected unknown base-pair lines in {out_path}")
-            self.assertIn("total_pairs", core["stats"], msg=f"missing total_pairs in {out_path}")
-            self.assertIn("total_bases", core["stats"], msg=f"missing total_bases in {out_path}")
-            self.assertIn("pair_type_counts", core["stats"], msg=f"missing pair_type_counts in {out_path}")
+            with self.subTest(path=str(out_path)):
+                core = self.mod.extract_core(out_path)
+                unknown = sum(1 for bp in core["base_pairs"] if bp.get("kind") == "unknown")
+                self.assertEqual(unknown, 0, msg="unexpected unknown base-pair lines")
+                self.assertIn("total_pairs", core["stats"])
+                self.assertIn("total_bases", core["stats"])
+                self.assertIn("pair_type_counts", core["stats"])
@@ -1,4 +1,6 @@
+import functools
 import importlib.util
+import io
 import json
 import sys
 import tempfile
@@ -6,11 +8,14 @@ import unittest
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=None)
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[1]
 
 
+@functools.lru_cache(maxsize=None)
 def _load_module(name: str, path: Path):
+    # Cached per (name, path): each tool module is executed once per test process.
     spec = importlib.util.spec_from_file_location(name, path)
     assert spec and spec.loader
     mod = importlib.util.module_from_spec(spec)
@@ -28,7 +33,8 @@ class TestPairsJson(unittest.TestCase):
 
     def test_pairs_json_out_writer_roundtrip(self) -> None:
         core_path = self.repo / "test" / "golden_core" / "pdb" / "tr0001" / "tr0001.pdb.core.json"
-        golden_core = json.loads(core_path.read_text(encoding="utf-8"))
+        data = core_path.read_bytes()
+        golden_core = json.loads(data)
         pairs = self.pairs_mod.pairs_json_from_core(
             golden_core,
             source_path="test/pdb/tr0001/tr0001.pdb.out",
@@ -36,12 +42,40 @@ class TestPairsJson(unittest.TestCase):
             options={},
         )
         out_text = self.pairs_mod.out_core_from_pairs_json(pairs)
-        with tempfile.NamedTemporaryFile("w", suffix=".out", encoding="utf-8", delete=True) as tmp:
-            tmp.write(out_text)
-            tmp.flush()
-            extracted = self.core_mod.extract_core(Path(tmp.name))
+        extracted = self.core_mod.extract_core_from_text(out_text)
         self.assertEqual(extracted, golden_core)
 
+        # The streaming writer emits exactly the same text, including when a
+        # flush lands mid-document.
+        for chunk_size in (1, 64, 1000, 64 * 1024):
+            buf = io.StringIO()
+            self.pairs_mod.out_core_stream_to(pairs, buf, chunk_size=chunk_size)
+            self.assertEqual(buf.getvalue(), out_text, msg=f"chunk_size={chunk_size}")
+
+    def test_write_out_streams_to_file(self) -> None:
+        core_path = self.repo / "test" / "golden_core" / "pdb" / "tr0001" / "tr0001.pdb.core.json"
+        pairs = self.pairs_mod.pairs_json_from_core(json.loads(core_path.read_bytes()))
+        with tempfile.TemporaryDirectory() as td:
+            pairs_path = Path(td) / "pairs.json"
+            pairs_path.write_bytes(json.dumps(pairs).encode("utf-8"))
+            out_path = Path(td) / "core.out"
+            code = self.pairs_mod.main(["write-out", str(pairs_path), "-o", str(out_path)])
+            self.assertEqual(code, 0)
+            self.assertEqual(out_path.read_text(encoding="utf-8"), self.pairs_mod.out_core_from_pairs_json(pairs))
+            self.assertEqual(sorted(p.name for p in Path(td).iterdir()), ["core.out", "pairs.json"])
+
+    def test_write_out_failure_keeps_existing_file(self) -> None:
+        bad = {"core": {"base_pairs": [{"i": 1, "j": 2, "resseq_i": 1, "resseq_j": 2, "base_i": "G", "base_j": "C", "kind": "pair"}]}}
+        with tempfile.TemporaryDirectory() as td:
+            pairs_path = Path(td) / "pairs.json"
+            pairs_path.write_bytes(json.dumps(bad).encode("utf-8"))
+            out_path = Path(td) / "core.out"
+            out_path.write_text("previous\n", encoding="utf-8")
+            with self.assertRaises(ValueError):
+                self.pairs_mod.main(["write-out", str(pairs_path), "-o", str(out_path)])
+            self.assertEqual(out_path.read_text(encoding="utf-8"), "previous\n")
+            self.assertEqual(sorted(p.name for p in Path(td).iterdir()), ["core.out", "pairs.json"])
+
     def test_validate_golden_manifest(self) -> None:
         manifest = self.repo / "test" / "golden_core" / "manifest.json"
         code = self.pairs_mod.main(["validate-golden", "--manifest", str(manifest)])